@@ -0,0 +1,71 @@
+import asyncio
+from typing import Optional
+
+import typer
+
+from server import (
+    ORPHAN_ROSTER_GRACE_SECONDS, client, drop_orphan_rosters, events_collection, link_roster_contacts,
+    migrate_embedded_rosters, migrate_event_counters, migrate_roster_references, rebuild_event_counters,
+)
+
+cli = typer.Typer(help="People Monitor maintenance commands")
+
+
+@cli.callback()
+def main():
+    """People Monitor maintenance commands"""
+
+
+def run(coroutine):
+    try:
+        return asyncio.run(coroutine)
+    finally:
+        client.close()
+
+
+@cli.command("rebuild-counters")
+def rebuild_counters(event_id: Optional[str] = typer.Argument(None, help="Rebuild a single event; defaults to every active event")):
+    """Reconcile materialized statistics counters against raw rosters and responses"""
+    async def rebuild():
+        query = {"id": event_id} if event_id else {"is_active": True}
+        rebuilt = 0
+        async for event in events_collection.find(query, {"_id": 0, "id": 1}):
+            stats = await rebuild_event_counters(event["id"])
+            typer.echo(f"{event['id']}: {stats['total_people']} people, "
+                       f"{stats['safe_count']} safe, {stats['need_help_count']} need help")
+            rebuilt += 1
+        return rebuilt
+
+    typer.echo(f"Rebuilt counters for {run(rebuild())} event(s)")
+
+
+@cli.command("migrate-people")
+def migrate_people():
+    """Key rosters by roster_id, move embedded rosters into the people collection and build their counters"""
+    async def migrate():
+        return await migrate_roster_references(), await migrate_embedded_rosters(), await migrate_event_counters()
+
+    rekeyed, migrated, counted = run(migrate())
+    typer.echo(f"Keyed {rekeyed} roster entries by roster_id")
+    typer.echo(f"Migrated rosters of {migrated} event(s)")
+    typer.echo(f"Built statistics counters for {counted} event(s)")
+
+
+@cli.command("link-contacts")
+def link_contacts():
+    """Enroll people added before the contact directory existed and link them to it"""
+    linked, repeats = run(link_roster_contacts())
+    typer.echo(f"Linked {linked} roster entries to the contact directory")
+    if repeats:
+        typer.echo(f"Left {repeats} repeated contact(s) unlinked")
+
+
+@cli.command("drop-orphan-rosters")
+def drop_orphans(grace_seconds: int = typer.Option(ORPHAN_ROSTER_GRACE_SECONDS, help="Seconds a roster must stay unreferenced")):
+    """Delete rosters no event references, such as copies left by an interrupted roster copy"""
+    rosters, people = run(drop_orphan_rosters(grace_seconds))
+    typer.echo(f"Deleted {rosters} orphaned roster(s) holding {people} people")
+
+
+if __name__ == "__main__":
+    cli()
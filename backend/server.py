@@ -1,22 +1,382 @@
-from fastapi import FastAPI, HTTPException, status, Depends, Request, UploadFile, File
+from fastapi import FastAPI, HTTPException, status, Depends, Query, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import List, Optional
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, defaultdict
+import asyncio
+import base64
+import bisect
+import cProfile
+import csv
+import gzip
+import heapq
+import hmac
+import html
+import itertools
 import os
+import random
+import re
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+import logging
 import uuid
 from datetime import datetime, timedelta
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pydantic import ValidationError
+from pymongo import ASCENDING, IndexModel, InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import json
-from bson import ObjectId
+from bson import ObjectId, json_util
 import jwt
 import bcrypt
 from passlib.context import CryptContext
 import pandas as pd
+import openpyxl
 import io
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
 
-app = FastAPI()
+try:
+    import brotli
+except ImportError:  # optional: without it the response page is served gzip-only
+    brotli = None
+
+logger = logging.getLogger("people_monitor")
+
+# Metrics, exposed in Prometheus text format at /metrics
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+LOOP_LAG_INTERVAL_SECONDS = 0.5
+metrics_registry = CollectorRegistry()
+HTTP_REQUESTS = Counter(
+    "people_monitor_http_requests", "HTTP requests by route template and status",
+    ["method", "route", "status"], registry=metrics_registry
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "people_monitor_http_request_duration_seconds", "Time until the response headers are sent, by route template",
+    ["method", "route"], registry=metrics_registry
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "people_monitor_http_requests_in_flight", "HTTP requests being handled", registry=metrics_registry
+)
+MONGO_OPERATION_DURATION = Histogram(
+    "people_monitor_mongo_operation_duration_seconds", "MongoDB operation latency by collection and operation",
+    ["collection", "operation"], registry=metrics_registry,
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+MONGO_OPERATION_ERRORS = Counter(
+    "people_monitor_mongo_operation_errors", "MongoDB operations that raised, by collection and operation",
+    ["collection", "operation"], registry=metrics_registry
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "people_monitor_password_hash_duration_seconds", "bcrypt time per hash or verification, excluding queueing",
+    ["operation"], registry=metrics_registry
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "people_monitor_password_hash_rejected", "Sign-ins turned away because the hashing queue was full",
+    registry=metrics_registry
+)
+EVENT_LOOP_LAG = Histogram(
+    "people_monitor_event_loop_lag_seconds", "How late a periodic event loop timer fires",
+    registry=metrics_registry, buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+
+MONGO_CURSOR_METHODS = {"sort", "skip", "limit", "batch_size", "hint", "max_time_ms", "allow_disk_use"}
+MONGO_OPERATIONS = {
+    "find_one", "find_one_and_update", "find_one_and_delete", "find_one_and_replace",
+    "insert_one", "insert_many", "update_one", "update_many", "replace_one", "delete_one", "delete_many",
+    "bulk_write", "count_documents", "distinct", "create_indexes",
+}
+
+class InstrumentedCursor:
+    """Times a find/aggregate cursor from its first fetch until it is exhausted
+
+    Only the time spent waiting on MongoDB counts; the caller's own work
+    between documents does not.
+    """
+
+    def __init__(self, cursor, collection, operation):
+        self.cursor = cursor
+        self.collection = collection
+        self.operation = operation
+        self.elapsed = 0.0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.cursor, name)
+        if name in MONGO_CURSOR_METHODS:
+            def chained(*args, **kwargs):
+                attribute(*args, **kwargs)
+                return self
+            return chained
+        return attribute
+
+    async def to_list(self, length=None):
+        started = time.perf_counter()
+        try:
+            return await self.cursor.to_list(length=length)
+        finally:
+            MONGO_OPERATION_DURATION.labels(self.collection, self.operation).observe(time.perf_counter() - started)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        started = time.perf_counter()
+        try:
+            return await self.cursor.__anext__()
+        except StopAsyncIteration:
+            MONGO_OPERATION_DURATION.labels(self.collection, self.operation).observe(
+                self.elapsed + time.perf_counter() - started
+            )
+            raise
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+class InstrumentedCollection:
+    """Thin wrapper recording the latency of every awaited Motor collection call"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getattr__(self, name):
+        attribute = getattr(self.collection, name)
+        if name in ("find", "aggregate"):
+            def cursor(*args, **kwargs):
+                return InstrumentedCursor(attribute(*args, **kwargs), self.collection.name, name)
+            return cursor
+        if name not in MONGO_OPERATIONS:
+            return attribute
+
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await attribute(*args, **kwargs)
+            except Exception:
+                MONGO_OPERATION_ERRORS.labels(self.collection.name, name).inc()
+                raise
+            finally:
+                MONGO_OPERATION_DURATION.labels(self.collection.name, name).observe(time.perf_counter() - started)
+        return timed
+
+class MetricsMiddleware:
+    """Counts requests and times them up to the response headers, by route template
+
+    Streaming responses (dashboard stream, exports) are timed to their first
+    byte, not for as long as they stay open.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_metrics(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                HTTP_REQUEST_DURATION.labels(scope["method"], route_template(scope)).observe(time.perf_counter() - started)
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUESTS.labels(scope["method"], route_template(scope), str(status_code)).inc()
+
+def route_template(scope):
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+class LoopLagMonitor:
+    """Measures event loop lag as the delay of a timer firing every LOOP_LAG_INTERVAL_SECONDS"""
+
+    def __init__(self, interval=LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self.last_lag = 0.0
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last_lag = max(0.0, time.perf_counter() - started - self.interval)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+
+loop_lag_monitor = LoopLagMonitor()
+
+# Opt-in request profiling: a sampled fraction of requests, plus any request
+# carrying X-Profile-Token: <PROFILE_TOKEN>. Off unless one of them is set.
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')
+PROFILE_MODE = os.environ.get('PROFILE_MODE', 'sample')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_SAMPLE_INTERVAL_SECONDS = 0.005
+IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get")}
+
+class StackSampler:
+    """Samples every thread's Python stack at a fixed interval into folded stacks
+
+    Covers work handed to threads (pandas parsing, bcrypt) that a profiler
+    hooked into the event loop thread would miss. Threads parked in an idle
+    wait are left out. The output is one "frame;frame;... count" line per
+    distinct stack, as read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.counts = defaultdict(int)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+
+    def enable(self):
+        self.thread.start()
+
+    def disable(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append((os.path.basename(frame.f_code.co_filename), frame.f_code.co_name, frame.f_lineno))
+                    frame = frame.f_back
+                if (stack[0][0], stack[0][1]) in IDLE_FRAMES:
+                    continue
+                self.counts[";".join(f"{name} ({filename}:{line})" for filename, name, line in reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, "w") as output:
+            for stack, count in self.counts.items():
+                output.write(f"{stack} {count}\n")
+
+class ProfilingMiddleware:
+    """Profiles selected requests and writes a profile plus a JSON sidecar per request
+
+    PROFILE_MODE=sample (default) writes folded stacks sampled across all
+    threads (.folded); PROFILE_MODE=cprofile runs cProfile on the event loop
+    thread (.prof, for snakeviz or flameprof). Either way, anything the
+    process does while the request is in progress is included, so profile
+    under representative but not overlapping load. One request is profiled
+    at a time, and streaming responses are dropped once their headers show
+    an event stream.
+    """
+
+    def __init__(self, app, sample_rate=PROFILE_SAMPLE_RATE, token=PROFILE_TOKEN, mode=PROFILE_MODE, directory=PROFILE_DIR):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.token = token
+        self.mode = mode
+        self.directory = directory
+        self.active = False
+
+    def selected(self, scope):
+        if self.token:
+            supplied = dict(scope["headers"]).get(b"x-profile-token")
+            if supplied is not None and hmac.compare_digest(supplied, self.token.encode()):
+                return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.active or not self.selected(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        self.active = True
+        profiler = cProfile.Profile() if self.mode == "cprofile" else StackSampler()
+        status_code = 500
+        streaming = False
+
+        async def send_with_status(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if content_type.startswith(b"text/event-stream") and not streaming:
+                    streaming = True
+                    profiler.disable()
+            await send(message)
+
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if not streaming:
+                profiler.disable()
+            self.active = False
+        
+        if not streaming:
+            try:
+                await self.write(scope, profiler, status_code, time.perf_counter() - started)
+            except Exception:
+                logger.exception("Writing the profile of %s %s failed", scope["method"], scope["path"])
+
+    async def write(self, scope, profiler, status_code, duration):
+        route = route_template(scope)
+        event_id = scope.get("path_params", {}).get("event_id")
+        roster_size = None
+        if event_id:
+            counter = await event_counters_collection.find_one({"event_id": event_id, "tag": None}, {"_id": 0, "total": 1})
+            roster_size = counter.get("total") if counter else None
+        
+        started_at = datetime.utcnow()
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-") or "root"
+        base = os.path.join(self.directory, f"{started_at.strftime('%Y%m%dT%H%M%S%f')}-{scope['method']}-{slug}")
+        profile_path = base + (".prof" if self.mode == "cprofile" else ".folded")
+        metadata = {
+            "method": scope["method"],
+            "route": route,
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "event_id": event_id,
+            "roster_size": roster_size,
+            "mode": self.mode,
+            "profile": os.path.basename(profile_path),
+            "worker": WORKER_ID,
+            "recorded_at": started_at.isoformat() + "Z",
+        }
+
+        def dump():
+            os.makedirs(self.directory, exist_ok=True)
+            if self.mode == "cprofile":
+                profiler.dump_stats(profile_path)
+            else:
+                profiler.dump(profile_path)
+            with open(base + ".json", "w") as sidecar:
+                json.dump(metadata, sidecar, indent=2)
+        await asyncio.to_thread(dump)
 
 # Security
 security = HTTPBearer()
@@ -25,6 +385,344 @@ SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Password hashing runs on its own threads; bcrypt releases the GIL
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', '64'))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 1
+
+# Authenticated user cache
+USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', '1024'))
+USER_CACHE_TTL_SECONDS = int(os.environ.get('USER_CACHE_TTL_SECONDS', '60'))
+
+# Keyset pagination
+MAX_PAGE_SIZE = 1000
+
+# Public response page cache
+RESPONSE_PAGE_CACHE_SIZE = int(os.environ.get('RESPONSE_PAGE_CACHE_SIZE', '256'))
+RESPONSE_PAGE_MAX_AGE = 30
+
+# Respond write mode: "direct" writes each response before acknowledging it;
+# "write_behind" acknowledges after validation and flushes coalesced batches.
+RESPOND_WRITE_MODE = os.environ.get('RESPOND_WRITE_MODE', 'direct')
+RESPOND_FLUSH_INTERVAL_MS = int(os.environ.get('RESPOND_FLUSH_INTERVAL_MS', '250'))
+RESPOND_FLUSH_BATCH_SIZE = int(os.environ.get('RESPOND_FLUSH_BATCH_SIZE', '500'))
+
+# Respond validation: roster membership cached per event
+ROSTER_MEMBERSHIP_CACHE_SIZE = int(os.environ.get('ROSTER_MEMBERSHIP_CACHE_SIZE', '1024'))
+
+# Maintenance: how long a roster must stay unreferenced before drop-orphan-rosters deletes it
+ORPHAN_ROSTER_GRACE_SECONDS = 300
+
+# Roster file imports are parsed and inserted this many rows at a time
+ROSTER_IMPORT_CHUNK_ROWS = int(os.environ.get('ROSTER_IMPORT_CHUNK_ROWS', '5000'))
+
+# Streaming NDJSON ingest writes every NDJSON_BATCH_SIZE valid lines
+NDJSON_BATCH_SIZE = int(os.environ.get('NDJSON_BATCH_SIZE', '1000'))
+NDJSON_MAX_LINE_BYTES = 64 * 1024
+
+# Background import jobs: a worker holds a renewable lease on each job it runs,
+# so a job whose worker died is picked up again once the lease runs out.
+IMPORT_JOB_CONCURRENCY = int(os.environ.get('IMPORT_JOB_CONCURRENCY', '2'))
+IMPORT_JOB_LEASE_SECONDS = int(os.environ.get('IMPORT_JOB_LEASE_SECONDS', '60'))
+IMPORT_JOB_POLL_SECONDS = 15
+IMPORT_MAX_REPORTED_ERRORS = 1000
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Roster export
+EXPORT_COLUMNS = ["Name", "Contact", "Tags", "Status", "Message", "Response Time"]
+EXPORT_BATCH_SIZE = 1000
+EXPORT_READ_BYTES = 64 * 1024
+
+# Public roster search
+ROSTER_SEARCH_CACHE_SIZE = int(os.environ.get('ROSTER_SEARCH_CACHE_SIZE', '256'))
+ROSTER_SEARCH_MAX_RESULTS = 20
+
+# Response timeline buckets, rolled up from per-minute counters
+TIMELINE_BUCKETS = {"1m": 1, "5m": 5, "15m": 15, "1h": 60}
+
+# Live dashboard stream
+STREAM_KEEPALIVE_SECONDS = 15
+# Lifetime of the token a dashboard opens its event stream with; it travels
+# in the URL, so it is scoped to one event and expires quickly
+STREAM_TOKEN_TTL_SECONDS = int(os.environ.get('STREAM_TOKEN_TTL_SECONDS', '60'))
+STREAM_QUEUE_SIZE = 1000
+
+# MongoDB connection
+MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '10'))
+MONGO_MAX_IDLE_TIME_MS = int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000'))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+
+# Motor keeps every round trip off the event loop; the pool bounds how many
+# operations can be in flight against mongod at once.
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
+db = client['people_monitor']
+events_collection = InstrumentedCollection(db['events'])
+people_collection = InstrumentedCollection(db['people'])
+responses_collection = InstrumentedCollection(db['responses'])
+users_collection = InstrumentedCollection(db['users'])
+event_counters_collection = InstrumentedCollection(db['event_counters'])
+import_jobs_collection = InstrumentedCollection(db['import_jobs'])
+contacts_collection = InstrumentedCollection(db['contacts'])
+response_history_collection = InstrumentedCollection(db['response_history'])
+response_timeline_collection = InstrumentedCollection(db['response_timeline'])
+import_uploads = AsyncIOMotorGridFSBucket(db, bucket_name="import_uploads")
+
+VERIFY_QUERY_PLANS = os.environ.get('VERIFY_QUERY_PLANS', 'true').lower() in ('1', 'true', 'yes')
+
+# Indexes backing every hot lookup; created idempotently at startup
+INDEXES = [
+    (users_collection, [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+    ]),
+    (events_collection, [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("created_by", ASCENDING), ("is_active", ASCENDING)], name="created_by_is_active"),
+        IndexModel([("roster_id", ASCENDING), ("is_active", ASCENDING)], name="roster_id_is_active"),
+        IndexModel(
+            [("created_by", ASCENDING), ("is_active", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+            name="created_by_is_active_created_at_id"
+        ),
+    ]),
+    (people_collection, [
+        IndexModel([("roster_id", ASCENDING), ("id", ASCENDING)], unique=True, name="roster_id_id_unique"),
+        IndexModel([("roster_id", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="roster_id_name_id"),
+        IndexModel(
+            [("roster_id", ASCENDING), ("tags", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)],
+            name="roster_id_tags_name_id"
+        ),
+        IndexModel(
+            [("roster_id", ASCENDING), ("contact_id", ASCENDING)], unique=True,
+            partialFilterExpression={"contact_id": {"$exists": True}}, name="roster_id_contact_id_unique"
+        ),
+        IndexModel([("contact_id", ASCENDING)], name="contact_id"),
+    ]),
+    (contacts_collection, [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("owner_id", ASCENDING), ("contact_key", ASCENDING)], unique=True, name="owner_id_contact_key_unique"),
+        IndexModel([("owner_id", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)], name="owner_id_name_id"),
+    ]),
+    (responses_collection, [
+        IndexModel([("event_id", ASCENDING), ("person_id", ASCENDING)], unique=True, name="event_id_person_id_unique"),
+        IndexModel(
+            [("event_id", ASCENDING), ("status", ASCENDING), ("person_id", ASCENDING)],
+            name="event_id_status_person_id"
+        ),
+    ]),
+    (event_counters_collection, [
+        IndexModel([("event_id", ASCENDING), ("tag", ASCENDING)], unique=True, name="event_id_tag_unique"),
+    ]),
+    (response_history_collection, [
+        IndexModel([("event_id", ASCENDING), ("time", ASCENDING)], name="event_id_time"),
+        IndexModel([("event_id", ASCENDING), ("person_id", ASCENDING), ("time", ASCENDING)], name="event_id_person_id_time"),
+    ]),
+    (response_timeline_collection, [
+        IndexModel([("event_id", ASCENDING), ("minute", ASCENDING)], unique=True, name="event_id_minute_unique"),
+    ]),
+    (import_jobs_collection, [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("state", ASCENDING), ("lease_expires_at", ASCENDING)], name="state_lease_expires_at"),
+    ]),
+]
+
+# Representative shapes of the queries issued by hot routes; each must be served by an index
+HOT_QUERIES = [
+    ("get_current_user", users_collection, {"email": "probe@example.com"}),
+    ("event ownership check", events_collection, {"id": "probe", "created_by": "probe"}),
+    ("roster membership", people_collection, {"roster_id": "probe", "id": "probe"}),
+    ("get_event_people", people_collection, {"roster_id": "probe"}),
+    ("get_event_people by tag", people_collection, {"roster_id": "probe", "tags": "probe"}),
+    ("roster sharers", events_collection, {"roster_id": "probe", "is_active": True}),
+    ("get_contacts", contacts_collection, {"owner_id": "probe"}),
+    ("get_contact_history", people_collection, {"contact_id": "probe"}),
+    ("get_events", events_collection, {"is_active": True, "created_by": "probe"}),
+    ("get_event_responses", responses_collection, {"event_id": "probe"}),
+    ("update_person_status", responses_collection, {"event_id": "probe", "person_id": "probe"}),
+    ("get_event_statistics", event_counters_collection, {"event_id": "probe"}),
+    ("get_events_overview", event_counters_collection, {"event_id": {"$in": ["probe"]}, "tag": None}),
+    ("get_event_timeline", response_timeline_collection, {"event_id": "probe", "minute": {"$gte": datetime(1970, 1, 1)}}),
+    ("import job claim", import_jobs_collection, {"state": {"$in": ["queued", "running"]}, "lease_expires_at": {"$lte": datetime(1970, 1, 1)}}),
+]
+
+class QueryPlanError(RuntimeError):
+    pass
+
+def plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+async def ensure_indexes():
+    for collection, indexes in INDEXES:
+        await collection.create_indexes(indexes)
+
+async def verify_query_plans():
+    """Fail startup if any hot query would fall back to a collection scan"""
+    collscans = []
+    for name, collection, query in HOT_QUERIES:
+        explain = await collection.find(query).explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if "COLLSCAN" in set(plan_stages(winning_plan)):
+            collscans.append(f"{name} on {collection.name} {query}")
+    if collscans:
+        raise QueryPlanError("Hot queries resolved to COLLSCAN: " + "; ".join(collscans))
+
+# Rosters live in the people collection, one document per (roster_id, id),
+# and events reference one by roster_id so that duplicates can share it.
+# Rosters used to be keyed by event_id, and before that embedded in an
+# event.people array.
+PERSON_PROJECTION = {"_id": 0, "roster_id": 0}
+MIGRATION_BATCH_SIZE = 1000
+LEGACY_PEOPLE_INDEXES = ("event_id_id_unique", "event_id_name_id", "event_id_tags_name_id")
+
+async def migrate_roster_references():
+    """Key rosters by roster_id, each existing event keeping its own id as its roster's id
+
+    Runs before ensure_indexes: the old (event_id, id) unique index has to go
+    first, since duplicated events hold people with the same ids. Idempotent.
+    """
+    existing = await people_collection.index_information()
+    for name in LEGACY_PEOPLE_INDEXES:
+        if name in existing:
+            await people_collection.drop_index(name)
+    await events_collection.update_many({"roster_id": {"$exists": False}}, [{"$set": {"roster_id": "$id"}}])
+    result = await people_collection.update_many({"roster_id": {"$exists": False}}, {"$rename": {"event_id": "roster_id"}})
+    return result.modified_count
+
+async def migrate_embedded_rosters():
+    """Move any embedded event.people arrays into the people collection
+
+    Idempotent: people are upserted by (roster_id, id) before the array is
+    removed, so an interrupted run can simply be repeated.
+    """
+    migrated = 0
+    async for event in events_collection.find({"people": {"$exists": True}}, {"_id": 0, "id": 1, "roster_id": 1, "people": 1}):
+        people = event.get("people") or []
+        for start in range(0, len(people), MIGRATION_BATCH_SIZE):
+            await people_collection.bulk_write([
+                UpdateOne(
+                    {"roster_id": event["roster_id"], "id": person["id"]},
+                    {"$setOnInsert": {"roster_id": event["roster_id"], **person}},
+                    upsert=True
+                )
+                for person in people[start:start + MIGRATION_BATCH_SIZE]
+            ], ordered=False)
+        await events_collection.update_one({"id": event["id"]}, {"$unset": {"people": ""}})
+        migrated += 1
+    return migrated
+
+async def link_roster_contacts():
+    """Enroll people added before the contact directory existed and link them to it
+
+    A contact repeated on one roster is linked once; the repeats stay
+    unlinked, since the roster's (roster_id, contact_id) index admits one.
+    Runs on startup after migrate_embedded_rosters, so imports never meet an
+    unlinked entry they could add a second time. Idempotent. Returns
+    (linked, repeats).
+    """
+    roster_ids = await people_collection.distinct("roster_id", {"contact_id": {"$exists": False}})
+    owners = {}
+    events = events_collection.find({"roster_id": {"$in": roster_ids}}, {"_id": 0, "roster_id": 1, "created_by": 1})
+    async for event in events:
+        owners.setdefault(event["roster_id"], event["created_by"])
+    linked = repeats = 0
+    for roster_id, owner_id in owners.items():
+        seen = set(await people_collection.distinct("contact_id", {"roster_id": roster_id, "contact_id": {"$exists": True}}))
+        batch = []
+        unlinked = people_collection.find(
+            {"roster_id": roster_id, "contact_id": {"$exists": False}}, {"_id": 1, "name": 1, "contact": 1}
+        )
+        async for person in unlinked:
+            person["contact_id"] = contact_id_for(owner_id, person["contact"])
+            if person["contact_id"] in seen:
+                repeats += 1
+                continue
+            seen.add(person["contact_id"])
+            batch.append(person)
+            if len(batch) == MIGRATION_BATCH_SIZE:
+                linked += await link_people(owner_id, batch)
+                batch = []
+        if batch:
+            linked += await link_people(owner_id, batch)
+    return linked, repeats
+
+async def unreferenced_roster_ids():
+    return set(await people_collection.distinct("roster_id")) - set(await events_collection.distinct("roster_id"))
+
+async def drop_orphan_rosters(grace_seconds=ORPHAN_ROSTER_GRACE_SECONDS):
+    """Delete rosters that no event, active or deleted, references any more
+
+    They are left behind when a copy-on-write copy (see writable_roster_id)
+    is interrupted before its event points at it, or its losing racer fails
+    to drop it. A copy in progress is unreferenced too, so only rosters
+    still unreferenced after grace_seconds are deleted. Returns (rosters,
+    people) deleted.
+    """
+    orphans = await unreferenced_roster_ids()
+    if orphans:
+        await asyncio.sleep(grace_seconds)
+        orphans &= await unreferenced_roster_ids()
+    if not orphans:
+        return 0, 0
+    result = await people_collection.delete_many({"roster_id": {"$in": list(orphans)}})
+    return len(orphans), result.deleted_count
+
+async def link_people(owner_id, people):
+    await enroll_contacts(owner_id, people)
+    await people_collection.bulk_write([
+        UpdateOne({"_id": person["_id"]}, {"$set": {"contact_id": person["contact_id"]}}) for person in people
+    ], ordered=False)
+    return len(people)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    rekeyed = await migrate_roster_references()
+    if rekeyed:
+        logger.info("Keyed %d roster entries by roster_id", rekeyed)
+    await ensure_indexes()
+    migrated = await migrate_embedded_rosters()
+    if migrated:
+        logger.info("Moved embedded rosters of %d events into the people collection", migrated)
+    counted = await migrate_event_counters()
+    if counted:
+        logger.info("Built statistics counters for %d events", counted)
+    linked, repeats = await link_roster_contacts()
+    if linked:
+        logger.info("Linked %d roster entries to the contact directory", linked)
+    if repeats:
+        logger.info("Left %d repeated contacts unlinked", repeats)
+    if VERIFY_QUERY_PLANS:
+        await verify_query_plans()
+        logger.info("Verified index usage for %d hot queries", len(HOT_QUERIES))
+    if RESPOND_WRITE_MODE == "write_behind":
+        response_write_buffer.start()
+    import_job_runner.start()
+    loop_lag_monitor.start()
+    yield
+    await loop_lag_monitor.stop()
+    await import_job_runner.stop()
+    await response_write_buffer.stop()
+    password_hasher.shutdown()
+    client.close()
+
+app = FastAPI(lifespan=lifespan)
+
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -32,16 +730,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
-
-# MongoDB connection
-MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
-client = MongoClient(MONGO_URL)
-db = client['people_monitor']
-events_collection = db['events']
-people_collection = db['people']
-responses_collection = db['responses']
-users_collection = db['users']
+app.add_middleware(MetricsMiddleware)
+if PROFILE_SAMPLE_RATE > 0 or PROFILE_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
 
 # Pydantic models
 class UserRegister(BaseModel):
@@ -76,7 +769,6 @@ class Event(BaseModel):
     calamity_type: str
     created_at: datetime
     created_by: str
-    people: List[Person] = []
     is_active: bool = True
 
 class StatusResponse(BaseModel):
@@ -86,98 +778,1494 @@ class StatusResponse(BaseModel):
     response_time: datetime
     message: Optional[str] = None
 
-class CreateEventRequest(BaseModel):
-    title: str
-    description: str
-    calamity_type: str
+class CreateEventRequest(BaseModel):
+    title: str
+    description: str
+    calamity_type: str
+
+class UpdateEventRequest(BaseModel):
+    title: str
+    description: str
+    calamity_type: str
+
+class AddPersonRequest(BaseModel):
+    name: str
+    contact: str
+    tags: List[str] = []
+
+class UpdatePersonRequest(BaseModel):
+    name: str
+    contact: str
+    tags: List[str] = []
+
+class BulkAddPeopleRequest(BaseModel):
+    people: List[AddPersonRequest]
+
+class UpdateStatusRequest(BaseModel):
+    person_id: str
+    person_name: str
+    status: str
+    message: Optional[str] = None
+
+class DuplicateEventRequest(BaseModel):
+    title: str
+    description: str
+
+class EnrollContactsRequest(BaseModel):
+    contact_ids: List[str]
+    tags: List[str] = []
+
+# Helper functions
+def serialize_doc(doc):
+    if doc is None:
+        return None
+    if isinstance(doc, dict):
+        for key, value in doc.items():
+            if isinstance(value, ObjectId):
+                doc[key] = str(value)
+    return doc
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+    to_encode = data.copy()
+    if expires_delta:
+        expire = datetime.utcnow() + expires_delta
+    else:
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a bounded thread pool
+
+    At most `workers` hashes run at once and at most `queue_size` more wait
+    for a thread; past that, callers get a 503 with Retry-After instead of
+    queueing without bound while the event loop keeps serving other requests.
+    """
+
+    def __init__(self, workers=PASSWORD_HASH_WORKERS, queue_size=PASSWORD_HASH_QUEUE_SIZE):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.max_pending = workers + queue_size
+        self.pending = 0
+
+    async def run(self, function, *args):
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, please retry",
+                headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+            )
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self.timed, function, *args)
+        finally:
+            self.pending -= 1
+
+    @staticmethod
+    def timed(function, *args):
+        with PASSWORD_HASH_DURATION.labels(function.__name__).time():
+            return function(*args)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher()
+
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await password_hasher.run(pwd_context.hash, password)
+
+class UserCache:
+    """Bounded LRU of user records keyed by token subject (email), with a TTL
+
+    Anything that changes or removes a user must call invalidate() with the
+    user's email; the TTL bounds how long another worker keeps serving the
+    old record. Lookup timings of misses give the latency each hit saves.
+    """
+
+    def __init__(self, max_entries=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+
+    def get(self, email):
+        entry = self.entries.get(email)
+        if entry is not None and entry[0] < time.monotonic():
+            del self.entries[email]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(email)
+        return dict(entry[1])
+
+    def put(self, email, user, lookup_seconds):
+        self.miss_seconds += lookup_seconds
+        self.entries[email] = (time.monotonic() + self.ttl, dict(user))
+        self.entries.move_to_end(email)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, email):
+        self.entries.pop(email, None)
+
+user_cache = UserCache()
+
+def invalidate_user(email):
+    """Drop a user's cached record after changing or removing it"""
+    user_cache.invalidate(email)
+
+async def authenticate_token(token: str, scope: Optional[str] = None, event_id: Optional[str] = None):
+    """The user a token was issued to; 401 unless the token carries exactly this scope and event_id
+
+    Login tokens have neither, so a scoped token (see create_stream_token)
+    cannot stand in for one, nor open another event's stream.
+    """
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None or payload.get("scope") != scope or payload.get("event_id") != event_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    except jwt.PyJWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = user_cache.get(email)
+    if user is not None:
+        return user
+    
+    started = time.perf_counter()
+    user = await users_collection.find_one({"email": email}, {"hashed_password": 0})
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user = serialize_doc(user)
+    user_cache.put(email, user, time.perf_counter() - started)
+    return user
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return await authenticate_token(credentials.credentials)
+
+def create_stream_token(user, event_id):
+    """A short-lived token that opens one event's dashboard stream and nothing else"""
+    return create_access_token(
+        {"sub": user["email"], "scope": "stream", "event_id": event_id},
+        timedelta(seconds=STREAM_TOKEN_TTL_SECONDS)
+    )
+
+class DashboardBroadcaster:
+    """Fans dashboard changes out to the live streams subscribed to each event
+
+    Subscribers are in-process queues, so a change is only seen by streams
+    served by the same worker that handled the write.
+    """
+
+    def __init__(self, queue_size=STREAM_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = defaultdict(set)
+
+    def subscribe(self, event_id):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers[event_id].add(queue)
+        return queue
+
+    def has_subscribers(self, event_id):
+        return bool(self.subscribers.get(event_id))
+
+    def unsubscribe(self, event_id, queue):
+        queues = self.subscribers.get(event_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[event_id]
+
+    def publish(self, event_id, message_type, **data):
+        queues = self.subscribers.get(event_id)
+        if not queues:
+            return
+        message = jsonable_encoder({"type": message_type, **data}, custom_encoder={ObjectId: str})
+        for queue in queues:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # A consumer this far behind gets a fresh snapshot instead of the backlog
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "resync"})
+
+dashboard_broadcaster = DashboardBroadcaster()
+
+class CachedPage:
+    def __init__(self, version, etag, body):
+        self.version = version
+        self.etag = etag
+        # Every encoding is compressed once, when the page is rendered
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+
+class VersionedLRUCache:
+    """LRU of per-event derived objects, each valid for the version it was built from
+
+    Cached values expose a ``version`` attribute. get_or_build lets one
+    request build a missing entry while concurrent requests wait for it.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.building = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, event_id, version):
+        value = self.entries.get(event_id)
+        if value is None or value.version != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(event_id)
+        return value
+
+    def put(self, event_id, value):
+        self.entries[event_id] = value
+        self.entries.move_to_end(event_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, event_id):
+        self.entries.pop(event_id, None)
+
+    async def get_or_build(self, event_id, version, build):
+        value = self.get(event_id, version)
+        if value is not None:
+            return value
+        key = (event_id, version)
+        pending = self.building.get(key)
+        if pending is None:
+            pending = self.building[key] = asyncio.ensure_future(self._build(key, build))
+        # Shielded so a disconnecting client does not cancel a build others wait on
+        return await asyncio.shield(pending)
+
+    async def _build(self, key, build):
+        try:
+            value = await build()
+            self.put(key[0], value)
+            return value
+        finally:
+            del self.building[key]
+
+response_page_cache = VersionedLRUCache(RESPONSE_PAGE_CACHE_SIZE)
+
+def fold_name(name):
+    """Case- and accent-insensitive form of a name for matching"""
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).split())
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class RosterSearchIndex:
+    """In-memory typeahead over one event's roster
+
+    Queries shorter than three characters are answered as word prefixes by
+    bisecting a sorted token list; longer ones intersect trigram postings and
+    then confirm the substring, so "ann" finds both "Anna" and "Joanne".
+    """
+
+    def __init__(self, version, people):
+        self.version = version
+        self.people = [(person["id"], person["name"]) for person in people]
+        self.folded = [fold_name(name) for _, name in self.people]
+        tokens = []
+        self.postings = defaultdict(list)
+        for i, name in enumerate(self.folded):
+            tokens.extend((token, i) for token in set(name.split()))
+            for gram in trigrams(name):
+                self.postings[gram].append(i)
+        tokens.sort()
+        self.tokens = tokens
+        self.token_keys = [token for token, _ in tokens]
+
+    def search(self, query, limit):
+        folded = fold_name(query)
+        if not folded:
+            return []
+        if len(folded) < 3:
+            candidates = set()
+            for token, i in self.tokens[bisect.bisect_left(self.token_keys, folded):]:
+                if not token.startswith(folded):
+                    break
+                candidates.add(i)
+        else:
+            postings = sorted((self.postings.get(gram, []) for gram in trigrams(folded)), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    break
+            candidates = {i for i in candidates if folded in self.folded[i]}
+        # Names that start with the query first, then alphabetical
+        ranked = heapq.nsmallest(limit, candidates, key=lambda i: (not self.folded[i].startswith(folded), self.folded[i]))
+        return [{"id": self.people[i][0], "name": self.people[i][1]} for i in ranked]
+
+roster_search_cache = VersionedLRUCache(ROSTER_SEARCH_CACHE_SIZE)
+
+class RosterMembership:
+    """person_id -> tags for the people of an event's roster seen at one public_version
+
+    Filled one person at a time as responders are validated, so no roster is
+    ever loaded whole; every roster change moves public_version, so a change
+    made through any worker is seen by the next respond without a TTL.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.members = {}
+
+roster_membership_cache = VersionedLRUCache(ROSTER_MEMBERSHIP_CACHE_SIZE)
+
+async def lookup_roster_member(event_id, person_id):
+    """Tags of a person on an event's roster, or None if they are not on it; 404 if there is no such event"""
+    event = await events_collection.find_one({"id": event_id}, {"_id": 0, "roster_id": 1, "public_version": 1})
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    version = event.get("public_version", 0)
+
+    async def build():
+        return RosterMembership(version)
+
+    membership = await roster_membership_cache.get_or_build(event_id, version, build)
+    tags = membership.members.get(person_id)
+    if tags is None:
+        # Served by the unique (roster_id, id) index; people not on the roster are not cached
+        person = await people_collection.find_one({"roster_id": event["roster_id"], "id": person_id}, {"_id": 0, "tags": 1})
+        if person is None:
+            return None
+        tags = membership.members[person_id] = person.get("tags", [])
+    return tags
+
+async def event_roster_id(event_id):
+    """The id of the roster an event references; 404 if there is no such event"""
+    event = await events_collection.find_one({"id": event_id}, {"_id": 0, "roster_id": 1})
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event["roster_id"]
+
+async def writable_roster_id(event_id, roster_id=None):
+    """The event's roster id for a write, copying the roster first if other active events share it
+
+    Duplicated events reference their source's roster instead of copying it;
+    the first event to edit a shared roster gets a private copy (same person
+    ids, so responses still match) and the others keep the original. If two
+    writes race to copy, the loser drops its copy and uses the winner's.
+    """
+    if roster_id is None:
+        roster_id = await event_roster_id(event_id)
+    sharers = await events_collection.count_documents({"roster_id": roster_id, "is_active": True}, limit=2)
+    if sharers < 2:
+        return roster_id
+    
+    copy_id = str(uuid.uuid4())
+    await people_collection.aggregate([
+        {"$match": {"roster_id": roster_id}},
+        {"$addFields": {"roster_id": {"$literal": copy_id}}},
+        {"$project": {"_id": 0}},
+        {"$merge": {"into": people_collection.name, "on": ["roster_id", "id"], "whenMatched": "keepExisting"}},
+    ]).to_list(length=None)
+    result = await events_collection.update_one({"id": event_id, "roster_id": roster_id}, {"$set": {"roster_id": copy_id}})
+    if not result.modified_count:
+        await people_collection.delete_many({"roster_id": copy_id})
+        return await writable_roster_id(event_id)
+    roster_membership_cache.invalidate(event_id)
+    return copy_id
+
+def preferred_encoding(accept_encoding, available):
+    """Pick br, then gzip, then identity according to an Accept-Encoding header"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return "identity"
+
+async def bump_event_version(event_id, public=False):
+    """Mark an event as changed for changes that do not otherwise touch its document
+
+    Call it only once the change and everything derived from it (counters,
+    history) has been written: the version keys the dashboard ETag, so a
+    read between an early bump and the derived writes would be served as
+    current until the next change.
+
+    ``public`` changes (event details and roster) also move public_version,
+    which keys everything served to responders.
+    """
+    increments = {"version": 1, "public_version": 1} if public else {"version": 1}
+    await events_collection.update_one({"id": event_id}, {"$inc": increments})
+    if public:
+        response_page_cache.invalidate(event_id)
+        roster_search_cache.invalidate(event_id)
+        roster_membership_cache.invalidate(event_id)
+
+def event_etag(event):
+    return f'W/"{event["id"]}-{event.get("version", 0)}"'
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
+
+def sse_message(message):
+    return f"data: {json.dumps(message)}\n\n"
+
+RESPONSE_STATUSES = ("safe", "need_help")
+
+def empty_tag_counts():
+    return {"total": 0, "safe": 0, "need_help": 0, "no_response": 0}
+
+def add_person_to_tag_stats(tag_stats, tags, person_status):
+    """Count one roster entry once under each of its distinct tags"""
+    for tag in dict.fromkeys(tags):
+        counts = tag_stats.get(tag)
+        if counts is None:
+            counts = tag_stats[tag] = empty_tag_counts()
+        counts["total"] += 1
+        counts[person_status] = counts.get(person_status, 0) + 1
+
+def build_statistics(total_people, status_counts, tag_stats):
+    responded = sum(status_counts.values())
+    return {
+        "total_people": total_people,
+        "safe_count": status_counts.get("safe", 0),
+        "need_help_count": status_counts.get("need_help", 0),
+        "no_response_count": total_people - responded,
+        "response_rate": (responded / total_people * 100) if total_people > 0 else 0,
+        "tag_statistics": tag_stats,
+        "last_updated": datetime.now()
+    }
+
+async def join_statistics(responses, roster):
+    """Hash-join streamed responses against a streamed roster in O(people + responses)
+
+    `responses` yields {person_id, status} and `roster` yields {id, tags}.
+    Responses are folded into a person_id -> status map before the roster is
+    read, so neither side is held as full documents.
+    """
+    status_by_person = {}
+    status_counts = {}
+    async for response in responses:
+        status_by_person[response["person_id"]] = response["status"]
+        status_counts[response["status"]] = status_counts.get(response["status"], 0) + 1
+
+    total_people = 0
+    tag_stats = {}
+    async for person in roster:
+        total_people += 1
+        person_status = status_by_person.get(person["id"], "no_response")
+        add_person_to_tag_stats(tag_stats, person.get("tags", []), person_status)
+
+    return build_statistics(total_people, status_counts, tag_stats)
+
+async def compute_event_statistics(event_id):
+    """Statistics for an event from its responses and roster, each streamed with a projection"""
+    roster_id = await event_roster_id(event_id)
+    return await join_statistics(
+        responses_collection.find({"event_id": event_id}, {"_id": 0, "person_id": 1, "status": 1}),
+        people_collection.find({"roster_id": roster_id}, {"_id": 0, "id": 1, "tags": 1}),
+    )
+
+# Materialized counters: one document per event (tag=None) plus one per tag,
+# each holding total/safe/need_help and adjusted with $inc by every mutation.
+# `seq` grows with every change to a document, so live dashboards can take
+# its absolute values and ignore any they have already seen.
+COUNTER_FIELDS = ("total",) + RESPONSE_STATUSES
+# How many applied write-behind batch ids a counter or timeline bucket keeps;
+# a batch is retried on the next flush, long before it falls off the end
+APPLIED_BATCHES_KEPT = 20
+
+def inc_once(query, increments, batch_id=None):
+    """An upserting $inc that, given a batch_id, applies at most once for that batch"""
+    update = {"$inc": increments}
+    if batch_id is not None:
+        query = {**query, "batches": {"$ne": batch_id}}
+        update["$push"] = {"batches": {"$each": [batch_id], "$slice": -APPLIED_BATCHES_KEPT}}
+    return UpdateOne(query, update, upsert=True)
+
+async def bulk_write_once(collection, operations):
+    """bulk_write operations built by inc_once, or inserts with deterministic ids
+
+    An upsert that misses because its document already holds the batch, or
+    an insert whose id is taken, fails with a duplicate key error: that
+    write was applied before. Those are tried once more, since two first
+    upserts of the same document race the same way, then treated as applied.
+    """
+    for _ in range(2):
+        if not operations:
+            return
+        try:
+            await collection.bulk_write(operations, ordered=False)
+            return
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if e.details.get("writeConcernErrors") or any(error["code"] != 11000 for error in errors):
+                raise
+            operations = [operations[error["index"]] for error in errors]
+
+def counter_deltas(tags, deltas, into=None):
+    """Map the event-level counter (None) and each tag counter to the same deltas"""
+    into = {} if into is None else into
+    for key in [None, *dict.fromkeys(tags)]:
+        target = into.setdefault(key, {})
+        for field, delta in deltas.items():
+            target[field] = target.get(field, 0) + delta
+    return into
+
+def status_change_deltas(previous_status, new_status):
+    deltas = {}
+    if previous_status in RESPONSE_STATUSES:
+        deltas[previous_status] = -1
+    if new_status in RESPONSE_STATUSES:
+        deltas[new_status] = deltas.get(new_status, 0) + 1
+    return {field: delta for field, delta in deltas.items() if delta}
+
+def people_total_deltas(people):
+    deltas_by_tag = {}
+    for person in people:
+        counter_deltas(person.get("tags", []), {"total": 1}, into=deltas_by_tag)
+    return deltas_by_tag
+
+async def apply_counter_deltas(event_id, deltas_by_tag, batch_id=None):
+    """$inc the counters; with a batch_id, a retry of the same batch leaves them unchanged"""
+    operations = []
+    tags = []
+    for tag, deltas in deltas_by_tag.items():
+        increments = {field: delta for field, delta in deltas.items() if delta}
+        if increments:
+            operations.append(inc_once({"event_id": event_id, "tag": tag}, {**increments, "seq": 1}, batch_id))
+            tags.append(tag)
+    if operations:
+        await bulk_write_once(event_counters_collection, operations)
+        if dashboard_broadcaster.has_subscribers(event_id):
+            # Absolute values rather than the deltas: a stream that subscribed
+            # just before its snapshot may already have this change in it
+            counters = await event_counters_collection.find(
+                {"event_id": event_id, "tag": {"$in": tags}}, {"_id": 0, "event_id": 0, "batches": 0}
+            ).to_list(length=None)
+            dashboard_broadcaster.publish(event_id, "counters", counters=counters)
+
+async def initialize_event_counters(event_id):
+    """Seed counters for a new, empty event"""
+    await event_counters_collection.insert_one(
+        {"event_id": event_id, "tag": None, "total": 0, "safe": 0, "need_help": 0}
+    )
+
+async def copy_event_counters(source_event_id, event_id):
+    """Seed a duplicated event's counters with the source roster totals and no responses"""
+    counters = await event_counters_collection.find(
+        {"event_id": source_event_id}, {"_id": 0, "tag": 1, "total": 1}
+    ).to_list(length=None)
+    if not any(counter["tag"] is None for counter in counters):
+        await rebuild_event_counters(event_id)
+        return
+    await event_counters_collection.insert_many([
+        {"event_id": event_id, "tag": counter["tag"], "total": counter.get("total", 0), "safe": 0, "need_help": 0}
+        for counter in counters
+    ])
+
+async def rebuild_event_counters(event_id):
+    """Reconcile the materialized counters with the raw roster and responses
+
+    Each (event_id, tag) document is replaced in place and only then are tags
+    no longer on the roster removed, so concurrent rebuilds cannot collide on
+    the unique index and readers never see the counters missing. A change
+    applied while the rebuild runs can still be overwritten; run it from the
+    maintenance paths, not per request.
+    """
+    stats = await compute_event_statistics(event_id)
+    documents = [{
+        "event_id": event_id,
+        "tag": None,
+        "total": stats["total_people"],
+        "safe": stats["safe_count"],
+        "need_help": stats["need_help_count"],
+    }]
+    for tag, counts in stats["tag_statistics"].items():
+        documents.append({"event_id": event_id, "tag": tag, **{field: counts.get(field, 0) for field in COUNTER_FIELDS}})
+    # Keep seq moving forward so streams take the rebuilt values over older ones
+    seqs = await event_counters_collection.distinct("seq", {"event_id": event_id})
+    seq = max(seqs, default=0) + 1
+    for document in documents:
+        document["seq"] = seq
+    await event_counters_collection.bulk_write([
+        ReplaceOne({"event_id": event_id, "tag": document["tag"]}, document, upsert=True) for document in documents
+    ], ordered=False)
+    await event_counters_collection.delete_many(
+        {"event_id": event_id, "tag": {"$nin": [document["tag"] for document in documents]}}
+    )
+    return stats
+
+async def migrate_event_counters():
+    """Build counters for active events that predate them
+
+    Runs on startup, so request paths can rely on every event having its
+    event-level counter; deleted events keep none. Idempotent. Returns the
+    number of events rebuilt.
+    """
+    counted = set(await event_counters_collection.distinct("event_id", {"tag": None}))
+    rebuilt = 0
+    async for event in events_collection.find({"is_active": True}, {"_id": 0, "id": 1}):
+        if event["id"] not in counted:
+            await rebuild_event_counters(event["id"])
+            rebuilt += 1
+    return rebuilt
+
+async def read_event_counters(event_id):
+    """The event's counter documents; migrate_event_counters has built them for older events"""
+    return await event_counters_collection.find(
+        {"event_id": event_id}, {"_id": 0, "event_id": 0, "batches": 0}
+    ).to_list(length=None)
+
+async def read_event_statistics(event_id):
+    """Statistics from the counter documents"""
+    return counters_statistics(await read_event_counters(event_id))
+
+def counters_statistics(counters):
+    # An event is only without its counter between creation and seeding
+    event_counter = next((c for c in counters if c["tag"] is None), {})
+    tag_stats = {}
+    for counter in counters:
+        if counter["tag"] is None or counter.get("total", 0) <= 0:
+            continue
+        counts = {field: counter.get(field, 0) for field in COUNTER_FIELDS}
+        counts["no_response"] = counts["total"] - sum(counts[s] for s in RESPONSE_STATUSES)
+        tag_stats[counter["tag"]] = counts
+    status_counts = {s: event_counter.get(s, 0) for s in RESPONSE_STATUSES}
+    return build_statistics(event_counter.get("total", 0), status_counts, tag_stats)
+
+def overview_statistics(counter):
+    """Event-level statistics from a counter document, without the per-tag breakdown"""
+    total_people = counter.get("total", 0)
+    responded = sum(counter.get(s, 0) for s in RESPONSE_STATUSES)
+    return {
+        "total_people": total_people,
+        "safe_count": counter.get("safe", 0),
+        "need_help_count": counter.get("need_help", 0),
+        "no_response_count": total_people - responded,
+        "response_rate": round(responded / total_people * 100, 1) if total_people else 0,
+    }
+
+async def read_events_overview(event_ids):
+    """Statistics for many events, plus their combined totals, from one aggregation over the counters
+
+    Only the event-level counter documents are read, so the cost is one
+    document per event whatever the size of the rosters.
+    """
+    match = {"event_id": {"$in": event_ids}, "tag": None}
+    facets = {
+        "events": [{"$project": {"_id": 0, "event_id": 1, **{field: 1 for field in COUNTER_FIELDS}}}],
+        "totals": [{"$group": {"_id": None, **{field: {"$sum": f"${field}"} for field in COUNTER_FIELDS}}}],
+    }
+    [result] = await event_counters_collection.aggregate([{"$match": match}, {"$facet": facets}]).to_list(length=1)
+    totals = result["totals"][0] if result["totals"] else {}
+    return {counter["event_id"]: overview_statistics(counter) for counter in result["events"]}, overview_statistics(totals)
+
+# Contact directory: one entry per owner and normalized contact, whose id is
+# derived from both, so the same employee enrolled from any event, import or
+# worker always links to the same contact_id without a read.
+CONTACT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "people-monitor/contacts")
+CONTACT_PROJECTION = {"_id": 0, "owner_id": 0, "contact_key": 0}
+CONTACT_FIELDS = {"id", "name", "contact", "created_at", "updated_at"}
+PHONE_NUMBER = re.compile(r"^\+?[\d\s().-]+$")
+
+def normalize_contact(contact):
+    """Key under which spellings of the same email address or phone number collide"""
+    contact = unicodedata.normalize("NFKC", contact).strip()
+    if "@" not in contact and PHONE_NUMBER.match(contact):
+        return re.sub(r"\D", "", contact)
+    return " ".join(contact.casefold().split())
+
+def contact_id_for(owner_id, contact):
+    return str(uuid.uuid5(CONTACT_NAMESPACE, f"{owner_id}:{normalize_contact(contact)}"))
+
+def dedupe_by_contact(owner_id, people):
+    """Link each person to their contact_id and split off repeats of a contact within the batch"""
+    seen = set()
+    unique, duplicates = [], []
+    for person in people:
+        person["contact_id"] = contact_id_for(owner_id, person["contact"])
+        if person["contact_id"] in seen:
+            duplicates.append(person)
+        else:
+            seen.add(person["contact_id"])
+            unique.append(person)
+    return unique, duplicates
+
+async def enroll_contacts(owner_id, people):
+    """Create or refresh the owner's directory entries for already linked people"""
+    now = datetime.now()
+    await contacts_collection.bulk_write([
+        UpdateOne(
+            {"owner_id": owner_id, "contact_key": normalize_contact(person["contact"])},
+            {
+                "$set": {"name": person["name"], "contact": person["contact"], "updated_at": now},
+                "$setOnInsert": {"id": person["contact_id"], "created_at": now},
+            },
+            upsert=True
+        )
+        for person in people
+    ], ordered=False)
+
+async def add_people_to_roster(event_id, owner_id, people):
+    """Enroll people in the owner's directory and add those not already on the event's roster
+
+    Repeats are dropped by contact, first within the batch and then against
+    the roster's unique (roster_id, contact_id) index. Someone already on the
+    roster under the same person id is a retried batch rather than a repeat,
+    and counts as added. Returns (added, duplicates); only people actually
+    inserted are announced.
+    """
+    unique, duplicates = dedupe_by_contact(owner_id, people)
+    if not unique:
+        return [], duplicates
+    await enroll_contacts(owner_id, unique)
+    roster_id = await writable_roster_id(event_id)
+    result = await people_collection.bulk_write([
+        UpdateOne({"roster_id": roster_id, "contact_id": person["contact_id"]}, {"$setOnInsert": person}, upsert=True)
+        for person in unique
+    ], ordered=False)
+    inserted = [unique[index] for index in sorted(result.upserted_ids)]
+    added = unique
+    if len(inserted) < len(unique):
+        upserted = set(result.upserted_ids)
+        missed = [person for index, person in enumerate(unique) if index not in upserted]
+        existing = {
+            doc["contact_id"]: doc["id"]
+            async for doc in people_collection.find(
+                {"roster_id": roster_id, "contact_id": {"$in": [person["contact_id"] for person in missed]}},
+                {"_id": 0, "id": 1, "contact_id": 1}
+            )
+        }
+        repeats = {person["id"] for person in missed if existing.get(person["contact_id"]) != person["id"]}
+        added = [person for person in unique if person["id"] not in repeats]
+        duplicates += [person for person in missed if person["id"] in repeats]
+    if inserted:
+        await announce_people_added(event_id, inserted)
+    return added, duplicates
+
+def added_message(added_count, error_count, duplicate_count, source=None):
+    message = f"Successfully added {added_count} people" + (f" from {source}" if source else "")
+    if error_count:
+        message += f" with {error_count} errors"
+    if duplicate_count:
+        message += f", skipping {duplicate_count} already on the roster"
+    return message
+
+async def announce_people_added(event_id, people):
+    dashboard_broadcaster.publish(event_id, "people_added", people=people)
+    await apply_counter_deltas(event_id, people_total_deltas(people))
+    await bump_event_version(event_id, public=True)
+
+def iter_roster_frames(fileobj, filename, chunk_rows=ROSTER_IMPORT_CHUNK_ROWS):
+    """Yield an uploaded roster file as DataFrames of at most `chunk_rows` rows
+
+    CSV goes through pandas' chunked reader and .xlsx through openpyxl in
+    read-only mode, so neither holds the whole sheet in memory; legacy .xls
+    has no streaming reader and is loaded in one piece. Frames are indexed so
+    that index + 2 is the row number in the file (row 1 being the header),
+    and the first frame is yielded even when the file has no data rows.
+    """
+    if filename.lower().endswith('.csv'):
+        with pd.read_csv(fileobj, dtype=str, chunksize=chunk_rows) as reader:
+            yield from reader
+    elif filename.lower().endswith('.xlsx'):
+        workbook = openpyxl.load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = ["" if value is None else str(value) for value in next(rows, ())]
+            width = len(header)
+            numbered = (
+                (number, row) for number, row in enumerate(rows)
+                if any(value is not None for value in row)
+            )
+            first = True
+            while True:
+                chunk = list(itertools.islice(numbered, chunk_rows))
+                if not chunk and not first:
+                    break
+                first = False
+                yield pd.DataFrame(
+                    [(tuple(row) + (None,) * width)[:width] for _, row in chunk],
+                    columns=header,
+                    index=[number for number, _ in chunk],
+                    dtype=object,
+                )
+        finally:
+            workbook.close()
+    else:
+        yield pd.read_excel(fileobj, dtype=str)
+
+def clean_tags(tags):
+    """Stripped, non-blank tags in first-seen order, each once"""
+    return list(dict.fromkeys(tag.strip() for tag in tags if tag.strip()))
+
+def roster_frame_to_people(frame, make_id=None):
+    """Column-wise conversion of one roster frame into new people and row errors
+
+    Tags come from a comma-separated Tags column and/or Tag1, Tag2, ...
+    columns, in that order and without repeats. `make_id`
+    maps a frame index to a person id; ids are random by default.
+    """
+    text = frame.astype(object).where(frame.notna(), "").astype(str)
+    names = text['Name'].str.strip()
+    contacts = text['Contact'].str.strip()
+    valid = (names != "") & (contacts != "")
+    errors = [f"Row {index + 2}: Name and contact are required" for index in frame.index[~valid]]
+    
+    listed_tags = text['Tags'][valid].str.split(',').tolist() if 'Tags' in text.columns else itertools.repeat([])
+    tag_columns = [
+        text[col][valid].str.strip().tolist()
+        for col in text.columns if col.startswith('Tag') and col != 'Tags'
+    ]
+    people = []
+    indexes = frame.index[valid].tolist()
+    for index, name, contact, listed, *extra in zip(indexes, names[valid].tolist(), contacts[valid].tolist(), listed_tags, *tag_columns):
+        tags = clean_tags([*listed, *extra])
+        person_id = make_id(index) if make_id else str(uuid.uuid4())
+        people.append({"id": person_id, "name": name, "contact": contact, "tags": tags})
+    return people, errors
+
+def new_person(person_data, person_id=None):
+    """Roster entry for an AddPersonRequest or UpdatePersonRequest, or None if its name or contact is blank"""
+    person = {
+        "id": person_id or str(uuid.uuid4()),
+        "name": person_data.name.strip(),
+        "contact": person_data.contact.strip(),
+        "tags": clean_tags(person_data.tags)
+    }
+    if not person["name"] or not person["contact"]:
+        return None
+    return person
+
+def ndjson_person(line, person_id=None):
+    """(person, None) for a valid NDJSON AddPersonRequest line, else (None, error)"""
+    try:
+        person = new_person(AddPersonRequest.model_validate_json(line), person_id)
+    except ValidationError as e:
+        return None, e.errors()[0]['msg']
+    if person is None:
+        return None, "Name and contact are required"
+    return person, None
+
+def iter_ndjson_people(fileobj, chunk_rows=ROSTER_IMPORT_CHUNK_ROWS, first_index=0, make_id=None):
+    """Yield (people, errors, rows, next_index) for NDJSON AddPersonRequest lines
+
+    Indexes are physical line numbers from 0, blank lines included, so an
+    invalid line is reported as "Line n" just like the synchronous NDJSON
+    upload reports it. Blank lines are skipped and not counted as rows.
+    """
+    people, errors, rows = [], [], 0
+    for index, line in enumerate(fileobj):
+        if index < first_index or not line.strip():
+            continue
+        rows += 1
+        person, error = ndjson_person(line, make_id(index) if make_id else None)
+        if error:
+            errors.append(f"Line {index + 1}: {error}")
+        else:
+            people.append(person)
+        if rows == chunk_rows:
+            yield people, errors, rows, index + 1
+            people, errors, rows = [], [], 0
+    if rows:
+        yield people, errors, rows, index + 1
+
+async def ndjson_lines(chunks, max_line_bytes=NDJSON_MAX_LINE_BYTES):
+    """Split an async byte stream into lines, holding at most one line in memory
+
+    A line longer than `max_line_bytes` is discarded as it arrives and
+    yielded as None, so the caller can report it without buffering it.
+    """
+    buffer = b""
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield None if oversized or len(line) > max_line_bytes else line
+            oversized = False
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            oversized = True
+    if oversized:
+        yield None
+    elif buffer:
+        yield None if len(buffer) > max_line_bytes else buffer
+
+def iter_roster_file_chunks(fileobj, filename, first_index=0, make_id=None):
+    """Yield (people, errors, rows, next_index) for a roster file, from row `first_index` on"""
+    frames = iter_roster_frames(fileobj, filename)
+    try:
+        for frame in frames:
+            # Expected columns: Name, Contact, Tags (optional), Tag1, Tag2, ... (optional)
+            if 'Name' not in frame.columns or 'Contact' not in frame.columns:
+                raise HTTPException(status_code=400, detail="File must have 'Name' and 'Contact' columns")
+            frame = frame[frame.index >= first_index]
+            if frame.empty:
+                continue
+            people, errors = roster_frame_to_people(frame, make_id)
+            yield people, errors, len(frame), int(frame.index[-1]) + 1
+    finally:
+        frames.close()
+
+async def chunks_in_thread(chunks):
+    """Iterate a blocking chunk generator off the event loop, one chunk per worker-thread call
+
+    A generator cannot be closed while a thread is still inside it, so if
+    the consumer is cancelled mid-chunk the pending call is waited for
+    before the generator is closed, and the cancellation carries on.
+    """
+    pending = None
+    try:
+        while True:
+            pending = asyncio.ensure_future(asyncio.to_thread(next, chunks, None))
+            chunk = await asyncio.shield(pending)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if pending is not None and not pending.done():
+            await asyncio.wait([pending])
+        chunks.close()
+
+# Keyset pagination: pages are ordered by a fixed list of sort fields and the
+# cursor carries the last row's values for them, so every page is an index seek.
+EVENT_FIELDS = {"_id", "id", "title", "description", "calamity_type", "created_at", "created_by", "is_active", "version", "roster_id"}
+PERSON_FIELDS = {"id", "name", "contact", "contact_id", "tags"}
+RESPONSE_FIELDS = {"_id", "event_id", "person_id", "person_name", "status", "response_time", "message"}
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+# What encode_cursor can hold; anything else (an operator document such as
+# {"$ne": null}, a regex) would change the meaning of keyset_after's filter
+CURSOR_VALUE_TYPES = (str, int, float, datetime, type(None))
+
+def decode_cursor(cursor, sort_fields):
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        values = None
+    if (
+        not isinstance(values, list) or len(values) != len(sort_fields)
+        or not all(isinstance(value, CURSOR_VALUE_TYPES) for value in values)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def keyset_after(sort_fields, values):
+    """Filter matching rows strictly after `values` in ascending (sort_fields) order"""
+    clauses = []
+    for i, field in enumerate(sort_fields):
+        clause = {previous: values[j] for j, previous in enumerate(sort_fields[:i])}
+        clause[field] = {"$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+def parse_fields(fields, allowed):
+    """Validate a comma-separated fields= projection against a resource's field set"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(requested) - allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+def page_projection(requested, sort_fields, default_projection):
+    if requested is None:
+        return default_projection
+    projection = {field: 1 for field in [*requested, *sort_fields]}
+    projection.setdefault("_id", 0)
+    return projection
+
+def finish_page(docs, limit, sort_fields, requested, response: Response):
+    """Trim the look-ahead row, emit X-Next-Cursor and drop fields only needed for the cursor"""
+    if limit is not None and len(docs) > limit:
+        docs = docs[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor([docs[-1].get(field) for field in sort_fields])
+    if requested is not None:
+        docs = [{field: doc[field] for field in requested if field in doc} for doc in docs]
+    return [serialize_doc(doc) for doc in docs]
+
+async def find_page(collection, query, sort_fields, limit, after, requested, response, default_projection=None):
+    if after:
+        query = {"$and": [query, keyset_after(sort_fields, decode_cursor(after, sort_fields))]}
+    cursor = collection.find(query, page_projection(requested, sort_fields, default_projection))
+    cursor = cursor.sort([(field, ASCENDING) for field in sort_fields])
+    if limit is not None:
+        cursor = cursor.limit(limit + 1)
+    docs = await cursor.to_list(length=None)
+    return finish_page(docs, limit, sort_fields, requested, response)
+
+def name_prefix_filter(field, prefix):
+    # An anchored, case-sensitive regex can be answered from the index
+    return {field: {"$regex": "^" + re.escape(prefix)}}
+
+# Text a spreadsheet would evaluate as a formula; phone numbers such as
+# "+1 (555) 010-9999" are left alone since they only ever evaluate to numbers.
+FORMULA_PREFIX = re.compile(r"^(?:[=@\t\r]|[+-](?![\d\s().-]*$))")
+
+def spreadsheet_cell(value):
+    return "'" + value if FORMULA_PREFIX.match(value) else value
+
+async def iter_export_rows(event_id):
+    """Yield the roster joined with each person's response as batches of export rows
+
+    The join runs in MongoDB, one index lookup per person, and the cursor is
+    consumed a batch at a time, so the whole roster is never held in memory.
+    """
+    pipeline = [
+        {"$match": {"roster_id": await event_roster_id(event_id)}},
+        {"$sort": {"name": ASCENDING, "id": ASCENDING}},
+        {"$lookup": {
+            "from": responses_collection.name,
+            "let": {"person_id": "$id"},
+            "pipeline": [
+                {"$match": {"event_id": event_id, "$expr": {"$eq": ["$person_id", "$$person_id"]}}},
+                {"$project": {"_id": 0, "status": 1, "message": 1, "response_time": 1}},
+            ],
+            "as": "response",
+        }},
+        {"$project": {"_id": 0, "name": 1, "contact": 1, "tags": 1, "response": 1}},
+    ]
+    rows = []
+    async for doc in people_collection.aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE):
+        response = doc["response"][0] if doc["response"] else {}
+        response_time = response.get("response_time")
+        rows.append([
+            spreadsheet_cell(doc["name"]),
+            spreadsheet_cell(doc["contact"]),
+            spreadsheet_cell(", ".join(doc.get("tags", []))),
+            response.get("status", "no_response"),
+            spreadsheet_cell(response.get("message") or ""),
+            response_time.isoformat() if response_time else "",
+        ])
+        if len(rows) == EXPORT_BATCH_SIZE:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+async def csv_export(batches):
+    """Encode export row batches as UTF-8 CSV (with a BOM so Excel detects the encoding)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+def append_rows(sheet, rows):
+    for row in rows:
+        sheet.append(row)
+
+async def xlsx_export(batches):
+    """Build an XLSX from export row batches and stream it out
+
+    openpyxl's write-only mode spools rows to disk as they are appended, but
+    the zip container is only complete once saved, so the workbook is saved
+    to a temporary file and streamed from there.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Roster")
+    sheet.append(EXPORT_COLUMNS)
+    async for rows in batches:
+        await asyncio.to_thread(append_rows, sheet, rows)
+    with tempfile.TemporaryFile() as output:
+        await asyncio.to_thread(workbook.save, output)
+        output.seek(0)
+        while chunk := await asyncio.to_thread(output.read, EXPORT_READ_BYTES):
+            yield chunk
+
+async def record_response_history(event_id, changes, batch_id=None):
+    """Append (response, previous status) pairs to the history and count them into minute buckets
+
+    Every accepted response is logged, including repeats of the same status;
+    `first_responses` counts people answering for the first time, and
+    `changes` those switching from one status to another. With a batch_id,
+    retrying the same batch writes nothing twice.
+    """
+    history = []
+    buckets = {}
+    for response, previous_status in changes:
+        entry = {"_id": f"{batch_id}:{response['person_id']}"} if batch_id else {}
+        history.append(InsertOne({
+            **entry,
+            "event_id": event_id,
+            "person_id": response["person_id"],
+            "status": response["status"],
+            "previous_status": previous_status,
+            "message": response.get("message"),
+            "time": response["response_time"],
+        }))
+        minute = response["response_time"].replace(second=0, microsecond=0)
+        bucket = buckets.setdefault(minute, defaultdict(int))
+        bucket["responses"] += 1
+        bucket[response["status"]] += 1
+        if previous_status is None:
+            bucket["first_responses"] += 1
+        elif previous_status != response["status"]:
+            bucket["changes"] += 1
+    await asyncio.gather(
+        bulk_write_once(response_history_collection, history),
+        bulk_write_once(response_timeline_collection, [
+            inc_once({"event_id": event_id, "minute": minute}, dict(counts), batch_id)
+            for minute, counts in buckets.items()
+        ]),
+    )
+
+async def write_response_batch(event_id, entries):
+    """Write a batch of (response, person tags) for one event; returns (written, failed)
+
+    Each response is swapped in with find_one_and_update, as on the direct
+    path, so a person's counter deltas come from the status their write
+    actually replaced, whatever other workers wrote meanwhile. `written`
+    holds (response, tags, previous status); `failed` the entries whose
+    write raised.
+    """
+    results = await asyncio.gather(*(
+        responses_collection.find_one_and_update(
+            {"event_id": event_id, "person_id": response["person_id"]},
+            {"$set": response},
+            projection={"_id": 0, "status": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE
+        )
+        for response, _ in entries
+    ), return_exceptions=True)
+    written, failed = [], []
+    for (response, tags), previous in zip(entries, results):
+        if isinstance(previous, Exception):
+            failed.append((response, tags))
+        else:
+            written.append((response, tags, previous["status"] if previous else None))
+    return written, failed
+
+async def record_response_batch(event_id, batch_id, written):
+    """Counters, stream events, history and version for written responses; retry-safe per batch_id"""
+    deltas_by_tag = {}
+    for response, tags, previous_status in written:
+        deltas = status_change_deltas(previous_status, response["status"])
+        if deltas:
+            counter_deltas(tags, deltas, into=deltas_by_tag)
+    for response, _, _ in written:
+        dashboard_broadcaster.publish(event_id, "response", response=response)
+    await apply_counter_deltas(event_id, deltas_by_tag, batch_id)
+    await record_response_history(event_id, [
+        (response, previous_status) for response, _, previous_status in written
+    ], batch_id)
+    await bump_event_version(event_id)
+
+class ResponseWriteBuffer:
+    """Write-behind queue for respond requests
+
+    Responses are coalesced per (event_id, person_id), so only the latest
+    answer from each person is written (and logged to the response
+    history), and flushed every
+    RESPOND_FLUSH_INTERVAL_MS or as soon as RESPOND_FLUSH_BATCH_SIZE are
+    pending. Durability: an acknowledged response lives only in this
+    process's memory until its flush completes. A crash or kill loses at
+    most one interval's worth; a clean shutdown flushes everything. A
+    failed write is retried on the next tick unless a newer response from
+    the same person has arrived in the meantime. Once written, a batch's
+    counters and history are retried under the batch id they were first
+    tried with, which the counters and timeline record, so nothing is
+    counted twice or dropped.
+    """
+
+    def __init__(self, interval_ms=RESPOND_FLUSH_INTERVAL_MS, batch_size=RESPOND_FLUSH_BATCH_SIZE):
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.pending = {}
+        # batch_id -> (event_id, written) for batches whose counters are not recorded yet
+        self.unrecorded = {}
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        self.task = None
 
-class UpdateEventRequest(BaseModel):
-    title: str
-    description: str
-    calamity_type: str
+    def add(self, response, tags):
+        self.pending[(response["event_id"], response["person_id"])] = (response, tags)
+        if len(self.pending) >= self.batch_size:
+            self.wakeup.set()
 
-class AddPersonRequest(BaseModel):
-    name: str
-    contact: str
-    tags: List[str] = []
+    def start(self):
+        self.stopping = False
+        self.task = asyncio.create_task(self.run())
 
-class UpdatePersonRequest(BaseModel):
-    name: str
-    contact: str
-    tags: List[str] = []
+    async def stop(self):
+        # Let a flush in progress finish rather than cancelling it halfway
+        # through a batch that has already been taken off `pending`
+        if self.task is not None:
+            self.stopping = True
+            self.wakeup.set()
+            await self.task
+            self.task = None
+        await self.flush()
 
-class BulkAddPeopleRequest(BaseModel):
-    people: List[AddPersonRequest]
+    async def run(self):
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
 
-class UpdateStatusRequest(BaseModel):
-    person_id: str
-    person_name: str
-    status: str
-    message: Optional[str] = None
+    async def flush(self):
+        for batch_id, (event_id, written) in list(self.unrecorded.items()):
+            await self.record(batch_id, event_id, written)
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        by_event = defaultdict(list)
+        for (event_id, _), entry in batch.items():
+            by_event[event_id].append(entry)
+        for event_id, entries in by_event.items():
+            written, failed = await write_response_batch(event_id, entries)
+            if failed:
+                logger.error("Writing %d responses for event %s failed; retrying", len(failed), event_id)
+                for response, tags in failed:
+                    self.pending.setdefault((event_id, response["person_id"]), (response, tags))
+            if written:
+                batch_id = str(uuid.uuid4())
+                self.unrecorded[batch_id] = (event_id, written)
+                await self.record(batch_id, event_id, written)
 
-class DuplicateEventRequest(BaseModel):
-    title: str
-    description: str
+    async def record(self, batch_id, event_id, written):
+        try:
+            await record_response_batch(event_id, batch_id, written)
+        except Exception:
+            logger.exception("Recording %d responses for event %s failed; retrying", len(written), event_id)
+        else:
+            del self.unrecorded[batch_id]
 
-# Helper functions
-def serialize_doc(doc):
-    if doc is None:
-        return None
-    if isinstance(doc, dict):
-        for key, value in doc.items():
-            if isinstance(value, ObjectId):
-                doc[key] = str(value)
-    return doc
+response_write_buffer = ResponseWriteBuffer()
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+# Background roster imports. The upload is kept in GridFS and the job's
+# progress in import_jobs, checkpointed after every chunk. Person ids are
+# derived from the job id and row, so re-running a chunk after a crash
+# between its insert and its checkpoint inserts nobody twice.
+IMPORT_JOB_PUBLIC_FIELDS = {
+    "_id": 0, "file_id": 0, "claimed_by": 0, "lease_expires_at": 0, "next_index": 0, "run_started_at": 0
+}
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def submit_import_job(event_id, user_id, filename, file_format, source):
+    """Store an upload in GridFS and queue a job to import it"""
+    job_id = str(uuid.uuid4())
+    file_id = await import_uploads.upload_from_stream(filename, source, metadata={"job_id": job_id})
+    now = datetime.utcnow()
+    job = {
+        "id": job_id,
+        "event_id": event_id,
+        "created_by": user_id,
+        "filename": filename,
+        "format": file_format,
+        "file_id": file_id,
+        "state": "queued",
+        "rows_processed": 0,
+        "added_count": 0,
+        "duplicate_count": 0,
+        "error_count": 0,
+        "errors": [],
+        "next_index": 0,
+        "rows_per_second": None,
+        "detail": None,
+        "claimed_by": None,
+        "lease_expires_at": datetime(1970, 1, 1),
+        "created_at": now,
+        "updated_at": now,
+        "finished_at": None,
+    }
+    await import_jobs_collection.insert_one(job)
+    import_job_runner.wake()
+    return {"job_id": job_id, "state": "queued", "status_url": f"/api/import-jobs/{job_id}"}
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def claim_import_job():
+    """Take the lease on a queued job, or on a running one whose worker stopped renewing it"""
+    now = datetime.utcnow()
+    return await import_jobs_collection.find_one_and_update(
+        {"state": {"$in": ["queued", "running"]}, "lease_expires_at": {"$lte": now}},
+        {"$set": {
+            "state": "running",
+            "claimed_by": WORKER_ID,
+            "lease_expires_at": now + timedelta(seconds=IMPORT_JOB_LEASE_SECONDS),
+            "run_started_at": now,
+            "updated_at": now,
+        }},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+def import_job_chunks(job, fileobj):
+    job_uuid = uuid.UUID(job["id"])
+
+    def make_id(index):
+        return str(uuid.uuid5(job_uuid, str(index)))
+    if job["format"] == "ndjson":
+        return iter_ndjson_people(io.TextIOWrapper(fileobj, encoding="utf-8"), first_index=job["next_index"], make_id=make_id)
+    return iter_roster_file_chunks(fileobj, job["filename"], first_index=job["next_index"], make_id=make_id)
+
+async def run_import_job(job):
+    """Import a claimed job chunk by chunk, checkpointing progress under the lease"""
+    owned = {"id": job["id"], "claimed_by": WORKER_ID}
+    progress = {field: job[field] for field in ("rows_processed", "added_count", "error_count", "errors", "next_index")}
+    progress["duplicate_count"] = job.get("duplicate_count", 0)
+    with tempfile.TemporaryFile() as upload:
+        await import_uploads.download_to_stream(job["file_id"], upload)
+        upload.seek(0)
+        chunks = chunks_in_thread(import_job_chunks(job, upload))
+        try:
+            async for people, errors, rows, next_index in chunks:
+                # Stop rather than leave people and counters behind under an event deleted mid-import
+                if not await events_collection.find_one({"id": job["event_id"], "is_active": True}, {"_id": 1}):
+                    raise HTTPException(status_code=404, detail="Event not found")
+                added, duplicates = await add_people_to_roster(job["event_id"], job["created_by"], people)
+                progress["rows_processed"] += rows
+                progress["added_count"] += len(added)
+                progress["duplicate_count"] += len(duplicates)
+                progress["error_count"] += len(errors)
+                progress["errors"] = (progress["errors"] + errors)[:IMPORT_MAX_REPORTED_ERRORS]
+                progress["next_index"] = next_index
+                now = datetime.utcnow()
+                elapsed = (now - job["run_started_at"]).total_seconds()
+                run_rows = progress["rows_processed"] - job["rows_processed"]
+                checkpoint = await import_jobs_collection.update_one(owned, {"$set": {
+                    **progress,
+                    "rows_per_second": round(run_rows / elapsed, 1) if elapsed > 0 else None,
+                    "lease_expires_at": now + timedelta(seconds=IMPORT_JOB_LEASE_SECONDS),
+                    "updated_at": now,
+                }})
+                if checkpoint.matched_count == 0:
+                    logger.warning("Lost the lease on import job %s; leaving it to its new worker", job["id"])
+                    return
+        finally:
+            await chunks.aclose()
     
-    user = users_collection.find_one({"email": email})
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+    await finish_import_job(job, "completed")
+
+async def finish_import_job(job, state, detail=None):
+    """Record a job's outcome and drop its upload, unless another worker has taken it over"""
+    now = datetime.utcnow()
+    finished = await import_jobs_collection.update_one({"id": job["id"], "claimed_by": WORKER_ID}, {"$set": {
+        "state": state, "detail": detail, "finished_at": now, "updated_at": now, "claimed_by": None
+    }})
+    if finished.matched_count:
+        await import_uploads.delete(job["file_id"])
+
+class ImportJobRunner:
+    """Claims and runs import jobs, at most IMPORT_JOB_CONCURRENCY at a time
+
+    Jobs are looked for when one is submitted through this worker and every
+    IMPORT_JOB_POLL_SECONDS, which also picks up jobs left behind by a
+    restart or by a worker that stopped renewing its lease.
+    """
+
+    def __init__(self, concurrency=IMPORT_JOB_CONCURRENCY):
+        self.concurrency = concurrency
+        self.running = {}
+        self.wakeup = asyncio.Event()
+        self.task = None
+
+    def wake(self):
+        self.wakeup.set()
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        tasks = [task for task in (self.task, *self.running.values()) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.task = None
+        # Hand unfinished jobs back straight away rather than when their lease runs out
+        await import_jobs_collection.update_many(
+            {"state": "running", "claimed_by": WORKER_ID},
+            {"$set": {"claimed_by": None, "lease_expires_at": datetime(1970, 1, 1)}}
         )
-    
-    user = serialize_doc(user)
-    return user
+
+    async def run(self):
+        while True:
+            try:
+                while len(self.running) < self.concurrency:
+                    job = await claim_import_job()
+                    if job is None:
+                        break
+                    self.running[job["id"]] = asyncio.create_task(self.process(job))
+            except Exception:
+                logger.exception("Claiming import jobs failed")
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=IMPORT_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def process(self, job):
+        try:
+            await run_import_job(job)
+        except asyncio.CancelledError:
+            # Shutting down: stop() hands the job back to resume from its checkpoint
+            raise
+        except HTTPException as e:
+            await finish_import_job(job, "failed", e.detail)
+        except Exception as e:
+            logger.exception("Import job %s failed", job["id"])
+            await finish_import_job(job, "failed", str(e))
+        finally:
+            self.running.pop(job["id"], None)
+            self.wake()
+
+import_job_runner = ImportJobRunner()
 
 # Authentication routes
 @app.post("/api/auth/register", response_model=Token)
 async def register(user: UserRegister):
     # Check if user already exists
-    existing_user = users_collection.find_one({"email": user.email})
+    existing_user = await users_collection.find_one({"email": user.email})
     if existing_user:
         raise HTTPException(
             status_code=400,
@@ -185,7 +2273,7 @@ async def register(user: UserRegister):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     user_id = str(uuid.uuid4())
     new_user = {
         "id": user_id,
@@ -195,7 +2283,8 @@ async def register(user: UserRegister):
         "created_at": datetime.utcnow()
     }
     
-    users_collection.insert_one(new_user)
+    await users_collection.insert_one(new_user)
+    invalidate_user(user.email)
     
     # Create access token
     access_token = create_access_token(data={"sub": user.email})
@@ -203,8 +2292,8 @@ async def register(user: UserRegister):
 
 @app.post("/api/auth/login", response_model=Token)
 async def login(user: UserLogin):
-    db_user = users_collection.find_one({"email": user.email})
-    if not db_user or not verify_password(user.password, db_user["hashed_password"]):
+    db_user = await users_collection.find_one({"email": user.email})
+    if not db_user or not await verify_password(user.password, db_user["hashed_password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -223,38 +2312,75 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
         "created_at": current_user["created_at"]
     }
 
+class CacheMetricsCollector:
+    """Reports the in-process caches' hit/miss counts and sizes at scrape time"""
+
+    def collect(self):
+        caches = {
+            "users": (user_cache, user_cache.entries),
+            "response_page": (response_page_cache, response_page_cache.entries),
+            "roster_search": (roster_search_cache, roster_search_cache.entries),
+            "roster_membership": (roster_membership_cache, roster_membership_cache.entries),
+        }
+        lookups = CounterMetricFamily("people_monitor_cache_lookups", "Cache lookups by result", labels=["cache", "result"])
+        entries = GaugeMetricFamily("people_monitor_cache_entries", "Entries held by each cache", labels=["cache"])
+        for name, (cache, held) in caches.items():
+            lookups.add_metric([name, "hit"], cache.hits)
+            lookups.add_metric([name, "miss"], cache.misses)
+            entries.add_metric([name], len(held))
+        yield lookups
+        yield entries
+        # With the user cache's miss count, gives the lookup latency each hit saves
+        yield CounterMetricFamily(
+            "people_monitor_user_cache_miss_seconds", "Time spent loading users on user cache misses",
+            value=user_cache.miss_seconds
+        )
+        yield GaugeMetricFamily(
+            "people_monitor_event_loop_lag_last_seconds", "Most recent event loop lag sample", value=loop_lag_monitor.last_lag
+        )
+        yield GaugeMetricFamily(
+            "people_monitor_respond_write_buffer_pending", "Responses waiting for a write-behind flush",
+            value=len(response_write_buffer.pending)
+        )
+
+metrics_registry.register(CacheMetricsCollector())
+
+@app.get("/metrics")
+async def get_metrics(request: Request):
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
+
 # Public routes (no authentication required)
 @app.get("/")
 async def root():
     return {"message": "People Monitor API", "status": "running"}
 
 # Public response page (for people to respond)
-@app.get("/api/respond/{event_id}", response_class=HTMLResponse)
-async def response_page(event_id: str):
-    event = events_collection.find_one({"id": event_id})
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+def render_response_page(event_id, event):
+    title = html.escape(event['title'])
+    description = html.escape(event['description'])
     
     # Simple HTML response form
     html_content = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>Respond to {event['title']}</title>
+        <title>Respond to {title}</title>
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <script src="https://cdn.tailwindcss.com"></script>
     </head>
     <body class="bg-gray-100 min-h-screen">
         <div class="container mx-auto px-4 py-8">
             <div class="max-w-md mx-auto bg-white rounded-lg shadow-md p-6">
-                <h1 class="text-2xl font-bold text-center mb-4 text-gray-800">{event['title']}</h1>
-                <p class="text-gray-600 mb-6 text-center">{event['description']}</p>
+                <h1 class="text-2xl font-bold text-center mb-4 text-gray-800">{title}</h1>
+                <p class="text-gray-600 mb-6 text-center">{description}</p>
                 
                 <div id="personSelect" class="mb-6">
-                    <label class="block text-sm font-medium text-gray-700 mb-2">Select Your Name:</label>
-                    <select id="personId" class="w-full p-2 border border-gray-300 rounded-md">
-                        <option value="">Choose your name...</option>
-                    </select>
+                    <label class="block text-sm font-medium text-gray-700 mb-2">Find Your Name:</label>
+                    <input id="personSearch" type="text" autocomplete="off" class="w-full p-2 border border-gray-300 rounded-md" placeholder="Start typing your name...">
+                    <ul id="personResults" class="hidden mt-1 border border-gray-200 rounded-md divide-y divide-gray-200"></ul>
+                    <p id="selectedPerson" class="hidden mt-2 text-sm text-gray-700"></p>
                 </div>
                 
                 <div id="statusForm" class="hidden">
@@ -287,39 +2413,59 @@ async def response_page(event_id: str):
         </div>
         
         <script>
-            const eventId = '{event_id}';
-            const people = {json.dumps(event.get('people', []))};
+            const eventId = {json.dumps(event_id)};
+            let selected = null;
+            let searchTimer = null;
             
-            // Populate person select
-            const personSelect = document.getElementById('personId');
-            people.forEach(person => {{
-                const option = document.createElement('option');
-                option.value = person.id;
-                option.textContent = person.name;
-                personSelect.appendChild(option);
-            }});
+            const personSearch = document.getElementById('personSearch');
+            const personResults = document.getElementById('personResults');
+            
+            function selectPerson(person) {{
+                selected = person;
+                personSearch.value = person.name;
+                personResults.classList.add('hidden');
+                const selectedPerson = document.getElementById('selectedPerson');
+                selectedPerson.textContent = `Responding as ${{person.name}}`;
+                selectedPerson.classList.remove('hidden');
+                document.getElementById('statusForm').classList.remove('hidden');
+            }}
+            
+            async function searchPeople(query) {{
+                const response = await fetch(`/api/respond/${{eventId}}/people?q=${{encodeURIComponent(query)}}`);
+                if (!response.ok || personSearch.value.trim() !== query) return;
+                const matches = await response.json();
+                personResults.replaceChildren(...matches.map(person => {{
+                    const item = document.createElement('li');
+                    item.textContent = person.name;
+                    item.className = 'p-2 cursor-pointer hover:bg-gray-100';
+                    item.addEventListener('click', () => selectPerson(person));
+                    return item;
+                }}));
+                personResults.classList.toggle('hidden', matches.length === 0);
+            }}
             
-            personSelect.addEventListener('change', function() {{
-                const statusForm = document.getElementById('statusForm');
-                if (this.value) {{
-                    statusForm.classList.remove('hidden');
-                }} else {{
-                    statusForm.classList.add('hidden');
+            personSearch.addEventListener('input', function() {{
+                selected = null;
+                document.getElementById('selectedPerson').classList.add('hidden');
+                document.getElementById('statusForm').classList.add('hidden');
+                clearTimeout(searchTimer);
+                const query = this.value.trim();
+                if (!query) {{
+                    personResults.classList.add('hidden');
+                    return;
                 }}
+                searchTimer = setTimeout(() => searchPeople(query), 200);
             }});
             
             async function submitResponse() {{
-                const personId = document.getElementById('personId').value;
                 const selectedStatus = document.querySelector('input[name="status"]:checked');
                 const message = document.getElementById('message').value;
                 
-                if (!personId || !selectedStatus) {{
+                if (!selected || !selectedStatus) {{
                     alert('Please select your name and status');
                     return;
                 }}
                 
-                const personName = people.find(p => p.id === personId).name;
-                
                 try {{
                     const response = await fetch(`/api/events/${{eventId}}/respond`, {{
                         method: 'POST',
@@ -327,8 +2473,8 @@ async def response_page(event_id: str):
                             'Content-Type': 'application/json',
                         }},
                         body: JSON.stringify({{
-                            person_id: personId,
-                            person_name: personName,
+                            person_id: selected.id,
+                            person_name: selected.name,
                             status: selectedStatus.value,
                             message: message
                         }})
@@ -349,17 +2495,64 @@ async def response_page(event_id: str):
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+    return html_content
+
+@app.get("/api/respond/{event_id}", response_class=HTMLResponse)
+async def response_page(event_id: str, request: Request):
+    """The public response form, rendered once per public_version and served precompressed"""
+    event = await events_collection.find_one({"id": event_id}, {"_id": 0, "public_version": 1})
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    version = event.get("public_version", 0)
+    page = response_page_cache.get(event_id, version)
+    etag = page.etag if page else f'W/"page-{event_id}-{version}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={RESPONSE_PAGE_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if page is None:
+        async def render():
+            event = await events_collection.find_one({"id": event_id}, {"_id": 0, "title": 1, "description": 1})
+            return CachedPage(version, etag, render_response_page(event_id, event).encode())
+        page = await response_page_cache.get_or_build(event_id, version, render)
+    
+    encoding = preferred_encoding(request.headers.get("accept-encoding"), page.bodies)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=page.bodies[encoding], media_type="text/html; charset=utf-8", headers=headers)
+
+@app.get("/api/respond/{event_id}/people")
+async def search_roster(event_id: str, q: str = Query(..., min_length=1, max_length=100),
+                        limit: int = Query(10, ge=1, le=ROSTER_SEARCH_MAX_RESULTS)):
+    """Public name typeahead for the response page; returns only ids and names"""
+    event = await events_collection.find_one({"id": event_id}, {"_id": 0, "public_version": 1, "roster_id": 1})
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    version = event.get("public_version", 0)
+
+    async def build():
+        people = await people_collection.find(
+            {"roster_id": event["roster_id"]}, {"_id": 0, "id": 1, "name": 1}
+        ).to_list(length=None)
+        return RosterSearchIndex(version, people)
+
+    index = await roster_search_cache.get_or_build(event_id, version, build)
+    return index.search(q, limit)
 
 @app.post("/api/events/{event_id}/respond")
 async def update_person_status(event_id: str, request: UpdateStatusRequest):
-    event = events_collection.find_one({"id": event_id})
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    if request.status not in RESPONSE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(RESPONSE_STATUSES)}")
     
-    # Check if person exists in event
-    person_exists = any(p["id"] == request.person_id for p in event.get("people", []))
-    if not person_exists:
+    # Check if person exists in event; 404s on its own if the event does not
+    tags = await lookup_roster_member(event_id, request.person_id)
+    if tags is None:
         raise HTTPException(status_code=404, detail="Person not found in event")
     
     # Store or update response
@@ -372,13 +2565,29 @@ async def update_person_status(event_id: str, request: UpdateStatusRequest):
         "message": request.message
     }
     
-    # Update existing response or insert new one
-    responses_collection.update_one(
+    if RESPOND_WRITE_MODE == "write_behind":
+        response_write_buffer.add(response, tags)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={"message": "Status accepted"})
+    
+    # Update existing response or insert new one, keeping the previous status
+    # so the counters can move this person from one bucket to the other
+    previous = await responses_collection.find_one_and_update(
         {"event_id": event_id, "person_id": request.person_id},
         {"$set": response},
-        upsert=True
+        projection={"_id": 0, "status": 1},
+        upsert=True,
+        return_document=ReturnDocument.BEFORE
     )
     
+    dashboard_broadcaster.publish(event_id, "response", response=response)
+    
+    previous_status = previous["status"] if previous else None
+    deltas = status_change_deltas(previous_status, request.status)
+    if deltas:
+        await apply_counter_deltas(event_id, counter_deltas(tags, deltas))
+    await record_response_history(event_id, [(response, previous_status)])
+    await bump_event_version(event_id)
+    
     return {"message": "Status updated successfully"}
 
 # Protected routes (require authentication)
@@ -392,24 +2601,48 @@ async def create_event(request: CreateEventRequest, current_user: dict = Depends
         "calamity_type": request.calamity_type,
         "created_at": datetime.now(),
         "created_by": current_user["id"],
-        "people": [],
-        "is_active": True
+        "is_active": True,
+        "version": 1,
+        "roster_id": event_id
     }
     
-    events_collection.insert_one(event)
+    await events_collection.insert_one(event)
+    await initialize_event_counters(event_id)
     return {"event_id": event_id, "message": "Event created successfully"}
 
 @app.get("/api/events")
-async def get_events(current_user: dict = Depends(get_current_user)):
-    events = []
-    for event in events_collection.find({"is_active": True, "created_by": current_user["id"]}):
-        event = serialize_doc(event)
-        events.append(event)
-    return events
+async def get_events(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    return await find_page(
+        events_collection,
+        {"is_active": True, "created_by": current_user["id"]},
+        ["created_at", "id"],
+        limit, after, parse_fields(fields, EVENT_FIELDS), response
+    )
+
+@app.get("/api/events/overview")
+async def get_events_overview(current_user: dict = Depends(get_current_user)):
+    """Status counts and response rates for all of the caller's active events"""
+    events = await events_collection.find(
+        {"is_active": True, "created_by": current_user["id"]},
+        {"_id": 0, "id": 1, "title": 1, "calamity_type": 1, "created_at": 1}
+    ).sort([("created_at", ASCENDING), ("id", ASCENDING)]).to_list(length=None)
+    by_event, totals = await read_events_overview([event["id"] for event in events])
+    
+    return {
+        "events": [{**event, **by_event.get(event["id"], overview_statistics({}))} for event in events],
+        "totals": {"events": len(events), **totals},
+        "last_updated": datetime.now(),
+    }
 
 @app.get("/api/events/{event_id}")
 async def get_event(event_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -418,25 +2651,31 @@ async def get_event(event_id: str, current_user: dict = Depends(get_current_user
 
 @app.put("/api/events/{event_id}")
 async def update_event(event_id: str, request: UpdateEventRequest, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Update event details
-    events_collection.update_one(
+    await events_collection.update_one(
         {"id": event_id, "created_by": current_user["id"]},
         {"$set": {
             "title": request.title,
             "description": request.description,
             "calamity_type": request.calamity_type
-        }}
+        }, "$inc": {"version": 1, "public_version": 1}}
+    )
+    response_page_cache.invalidate(event_id)
+    roster_search_cache.invalidate(event_id)
+    dashboard_broadcaster.publish(
+        event_id, "event_updated",
+        event={"title": request.title, "description": request.description, "calamity_type": request.calamity_type}
     )
     
     return {"message": "Event updated successfully"}
 
 @app.post("/api/events/{event_id}/duplicate")
 async def duplicate_event(event_id: str, request: DuplicateEventRequest, current_user: dict = Depends(get_current_user)):
-    original_event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    original_event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not original_event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -449,95 +2688,135 @@ async def duplicate_event(event_id: str, request: DuplicateEventRequest, current
         "calamity_type": original_event["calamity_type"],
         "created_at": datetime.now(),
         "created_by": current_user["id"],
-        "people": original_event.get("people", []),  # Copy all people
-        "is_active": True
+        "is_active": True,
+        "version": 1,
+        # Share the roster; whichever event edits it first gets its own copy
+        "roster_id": original_event["roster_id"]
     }
     
-    events_collection.insert_one(new_event)
+    await events_collection.insert_one(new_event)
+    await copy_event_counters(event_id, new_event_id)
     return {"event_id": new_event_id, "message": "Event duplicated successfully"}
 
 @app.post("/api/events/{event_id}/people")
 async def add_person_to_event(event_id: str, request: AddPersonRequest, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    person_id = str(uuid.uuid4())
-    person = {
-        "id": person_id,
-        "name": request.name,
-        "contact": request.contact,
-        "tags": request.tags
-    }
+    person = new_person(request)
+    if person is None:
+        raise HTTPException(status_code=400, detail="Name and contact are required")
     
-    events_collection.update_one(
-        {"id": event_id},
-        {"$push": {"people": person}}
-    )
+    added, _ = await add_people_to_roster(event_id, current_user["id"], [person])
+    if not added:
+        raise HTTPException(status_code=409, detail="Someone with this contact is already in the event")
     
-    return {"person_id": person_id, "message": "Person added successfully"}
+    return {"person_id": person["id"], "message": "Person added successfully"}
 
 @app.put("/api/events/{event_id}/people/{person_id}")
 async def update_person_in_event(event_id: str, person_id: str, request: UpdatePersonRequest, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Check if person exists in event
-    person_exists = any(p["id"] == person_id for p in event.get("people", []))
-    if not person_exists:
+    # Update the person, keeping their previous tags for the counters
+    update = new_person(request, person_id)
+    if update is None:
+        raise HTTPException(status_code=400, detail="Name and contact are required")
+    update["contact_id"] = contact_id_for(current_user["id"], update["contact"])
+    try:
+        person = await people_collection.find_one_and_update(
+            {"roster_id": await writable_roster_id(event_id, event["roster_id"]), "id": person_id},
+            {"$set": update},
+            projection={"_id": 0, "tags": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Someone with this contact is already in the event")
+    if person is None:
         raise HTTPException(status_code=404, detail="Person not found in event")
-    
-    # Update person in the people array
-    events_collection.update_one(
-        {"id": event_id, "people.id": person_id},
-        {"$set": {
-            "people.$.name": request.name,
-            "people.$.contact": request.contact,
-            "people.$.tags": request.tags
-        }}
+    await enroll_contacts(current_user["id"], [update])
+    dashboard_broadcaster.publish(
+        event_id, "person_updated",
+        person={"id": person_id, "name": update["name"], "contact": update["contact"], "tags": update["tags"]}
     )
     
+    # Move the person's counts from tags they lost to tags they gained
+    old_tags = set(person.get("tags", []))
+    new_tags = set(update["tags"])
+    if old_tags != new_tags:
+        response = await responses_collection.find_one(
+            {"event_id": event_id, "person_id": person_id}, {"_id": 0, "status": 1}
+        )
+        deltas = {"total": 1}
+        if response and response["status"] in RESPONSE_STATUSES:
+            deltas[response["status"]] = 1
+        deltas_by_tag = {}
+        for tag in old_tags - new_tags:
+            deltas_by_tag[tag] = {field: -delta for field, delta in deltas.items()}
+        for tag in new_tags - old_tags:
+            deltas_by_tag[tag] = dict(deltas)
+        await apply_counter_deltas(event_id, deltas_by_tag)
+    await bump_event_version(event_id, public=True)
+    
     return {"message": "Person updated successfully"}
 
 @app.delete("/api/events/{event_id}/people/{person_id}")
 async def remove_person_from_event(event_id: str, person_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
+    # Checked first so an unknown id neither copies a shared roster nor moves the version
+    if not await people_collection.find_one({"roster_id": event["roster_id"], "id": person_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Person not found in event")
     
     # Remove person from event
-    events_collection.update_one(
-        {"id": event_id},
-        {"$pull": {"people": {"id": person_id}}}
+    person = await people_collection.find_one_and_delete(
+        {"roster_id": await writable_roster_id(event_id, event["roster_id"]), "id": person_id},
+        projection={"_id": 0, "tags": 1}
     )
+    dashboard_broadcaster.publish(event_id, "person_removed", person_id=person_id)
     
     # Also remove any responses from this person
-    responses_collection.delete_many({"event_id": event_id, "person_id": person_id})
+    response = await responses_collection.find_one_and_delete(
+        {"event_id": event_id, "person_id": person_id}, projection={"_id": 0, "status": 1}
+    )
+    
+    if person is not None:
+        deltas = {"total": -1}
+        if response and response["status"] in RESPONSE_STATUSES:
+            deltas[response["status"]] = -1
+        await apply_counter_deltas(event_id, counter_deltas(person.get("tags", []), deltas))
+    await bump_event_version(event_id, public=True)
     
     return {"message": "Person removed successfully"}
 
 @app.post("/api/events/{event_id}/people/bulk")
-async def bulk_add_people_to_event(event_id: str, request: BulkAddPeopleRequest, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+async def bulk_add_people_to_event(
+    event_id: str,
+    request: BulkAddPeopleRequest,
+    background: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    if background:
+        lines = "".join(person.model_dump_json() + "\n" for person in request.people)
+        job = await submit_import_job(event_id, current_user["id"], "people.ndjson", "ndjson", lines.encode())
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job)
+    
     added_people = []
     errors = []
     
     for i, person_data in enumerate(request.people):
         try:
-            person_id = str(uuid.uuid4())
-            person = {
-                "id": person_id,
-                "name": person_data.name.strip(),
-                "contact": person_data.contact.strip(),
-                "tags": [tag.strip() for tag in person_data.tags if tag.strip()]
-            }
+            person = new_person(person_data)
             
             # Basic validation
-            if not person["name"] or not person["contact"]:
+            if person is None:
                 errors.append(f"Row {i+1}: Name and contact are required")
                 continue
                 
@@ -546,165 +2825,473 @@ async def bulk_add_people_to_event(event_id: str, request: BulkAddPeopleRequest,
         except Exception as e:
             errors.append(f"Row {i+1}: {str(e)}")
     
-    if added_people:
-        events_collection.update_one(
-            {"id": event_id},
-            {"$push": {"people": {"$each": added_people}}}
-        )
+    added_people, duplicates = await add_people_to_roster(event_id, current_user["id"], added_people)
     
-    result = {
+    return {
         "added_count": len(added_people),
+        "duplicate_count": len(duplicates),
         "total_requested": len(request.people),
         "errors": errors,
-        "message": f"Successfully added {len(added_people)} people"
+        "message": added_message(len(added_people), len(errors), len(duplicates))
     }
-    
-    if errors:
-        result["message"] += f" with {len(errors)} errors"
-    
-    return result
 
 @app.post("/api/events/{event_id}/people/bulk/excel")
-async def bulk_add_people_from_excel(event_id: str, file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+async def bulk_add_people_from_excel(
+    event_id: str,
+    file: UploadFile = File(...),
+    background: bool = False,
+    current_user: dict = Depends(get_current_user)
+):
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Validate file type
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Please upload an Excel file (.xlsx or .xls)")
+    if not file.filename.lower().endswith(('.xlsx', '.xls', '.csv')):
+        raise HTTPException(status_code=400, detail="Please upload an Excel or CSV file (.xlsx, .xls or .csv)")
     
+    if background:
+        file_format = file.filename.rsplit('.', 1)[-1].lower()
+        job = await submit_import_job(event_id, current_user["id"], file.filename, file_format, file.file)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job)
+    
+    added_count = 0
+    duplicate_count = 0
+    total_rows = 0
+    errors = []
     try:
-        # Read Excel file
-        content = await file.read()
-        df = pd.read_excel(io.BytesIO(content))
-        
-        # Expected columns: Name, Contact, Tags (optional)
-        if 'Name' not in df.columns or 'Contact' not in df.columns:
-            raise HTTPException(status_code=400, detail="Excel file must have 'Name' and 'Contact' columns")
-        
-        added_people = []
-        errors = []
-        
-        for index, row in df.iterrows():
-            try:
-                # Parse data
-                name = str(row['Name']).strip() if pd.notna(row['Name']) else ""
-                contact = str(row['Contact']).strip() if pd.notna(row['Contact']) else ""
-                
-                # Parse tags - could be comma-separated or in separate columns
-                tags = []
-                if 'Tags' in df.columns and pd.notna(row['Tags']):
-                    tags = [tag.strip() for tag in str(row['Tags']).split(',') if tag.strip()]
-                
-                # Check for additional tag columns (Tag1, Tag2, etc.)
-                for col in df.columns:
-                    if col.startswith('Tag') and col != 'Tags' and pd.notna(row[col]):
-                        tag = str(row[col]).strip()
-                        if tag and tag not in tags:
-                            tags.append(tag)
-                
-                # Validation
-                if not name or not contact:
-                    errors.append(f"Row {index+2}: Name and contact are required")
-                    continue
-                
-                person_id = str(uuid.uuid4())
-                person = {
-                    "id": person_id,
-                    "name": name,
-                    "contact": contact,
-                    "tags": tags
-                }
-                
-                added_people.append(person)
-                
-            except Exception as e:
-                errors.append(f"Row {index+2}: {str(e)}")
-        
-        # Add people to event
-        if added_people:
-            events_collection.update_one(
-                {"id": event_id},
-                {"$push": {"people": {"$each": added_people}}}
-            )
-        
-        result = {
-            "added_count": len(added_people),
-            "total_rows": len(df),
-            "errors": errors,
-            "message": f"Successfully added {len(added_people)} people from Excel file"
-        }
-        
-        if errors:
-            result["message"] += f" with {len(errors)} errors"
-        
-        return result
-        
+        # Parse off the event loop one chunk at a time, inserting each as it is ready
+        chunks = chunks_in_thread(iter_roster_file_chunks(file.file, file.filename))
+        try:
+            async for people, chunk_errors, rows, _ in chunks:
+                added, duplicates = await add_people_to_roster(event_id, current_user["id"], people)
+                added_count += len(added)
+                duplicate_count += len(duplicates)
+                total_rows += rows
+                errors.extend(chunk_errors)
+        finally:
+            await chunks.aclose()
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing Excel file: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error processing file after {added_count} people were added: {str(e)}")
+    
+    return {
+        "added_count": added_count,
+        "duplicate_count": duplicate_count,
+        "total_rows": total_rows,
+        "errors": errors,
+        "message": added_message(added_count, len(errors), duplicate_count, file.filename)
+    }
+
+@app.post("/api/events/{event_id}/people/ndjson")
+async def stream_add_people_to_event(event_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Add people from an NDJSON body of AddPersonRequest objects, one per line
+
+    The body is read as it arrives, validated line by line and written every
+    NDJSON_BATCH_SIZE valid lines, so memory stays flat whatever its size.
+    """
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    batch = []
+    errors = []
+    error_count = 0
+    added_count = 0
+    duplicate_count = 0
+    total_lines = 0
+    line_number = 0
+    async for line in ndjson_lines(request.stream()):
+        line_number += 1
+        if line is not None and not line.strip():
+            continue
+        total_lines += 1
+        if line is None:
+            person, error = None, f"Line is longer than {NDJSON_MAX_LINE_BYTES} bytes"
+        else:
+            person, error = ndjson_person(line)
+        if error:
+            error_count += 1
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append(f"Line {line_number}: {error}")
+            continue
+        
+        batch.append(person)
+        if len(batch) == NDJSON_BATCH_SIZE:
+            added, duplicates = await add_people_to_roster(event_id, current_user["id"], batch)
+            added_count += len(added)
+            duplicate_count += len(duplicates)
+            batch = []
+    
+    if batch:
+        added, duplicates = await add_people_to_roster(event_id, current_user["id"], batch)
+        added_count += len(added)
+        duplicate_count += len(duplicates)
+    
+    return {
+        "added_count": added_count,
+        "duplicate_count": duplicate_count,
+        "total_requested": total_lines,
+        "error_count": error_count,
+        "errors": errors,
+        "message": added_message(added_count, error_count, duplicate_count)
+    }
+
+@app.post("/api/events/{event_id}/people/enroll")
+async def enroll_contacts_in_event(event_id: str, request: EnrollContactsRequest, current_user: dict = Depends(get_current_user)):
+    """Add people from the caller's contact directory, skipping those already in the event"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    contacts = await contacts_collection.find(
+        {"owner_id": current_user["id"], "id": {"$in": request.contact_ids}}, {"_id": 0, "name": 1, "contact": 1}
+    ).to_list(length=None)
+    tags = clean_tags(request.tags)
+    people = [
+        {"id": str(uuid.uuid4()), "name": contact["name"], "contact": contact["contact"], "tags": tags}
+        for contact in contacts
+    ]
+    added, duplicates = await add_people_to_roster(event_id, current_user["id"], people)
+    
+    return {
+        "added_count": len(added),
+        "duplicate_count": len(duplicates),
+        "not_found_count": len(set(request.contact_ids)) - len(contacts),
+        "message": added_message(len(added), 0, len(duplicates))
+    }
+
+@app.get("/api/import-jobs/{job_id}")
+async def get_import_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await import_jobs_collection.find_one({"id": job_id, "created_by": current_user["id"]}, IMPORT_JOB_PUBLIC_FIELDS)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    if job["state"] == "completed":
+        job["message"] = added_message(
+            job["added_count"], job["error_count"], job.get("duplicate_count", 0), job["filename"]
+        )
+    return job
+
+@app.get("/api/contacts")
+async def get_contacts(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    name: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """The caller's contact directory ordered by name; pages with limit/after, filters by name prefix"""
+    query = {"owner_id": current_user["id"]}
+    if name:
+        query.update(name_prefix_filter("name", name))
+    return await find_page(
+        contacts_collection, query, ["name", "id"], limit, after, parse_fields(fields, CONTACT_FIELDS), response, CONTACT_PROJECTION
+    )
+
+@app.get("/api/contacts/{contact_id}/history")
+async def get_contact_history(contact_id: str, current_user: dict = Depends(get_current_user)):
+    """Every event a contact is enrolled in, newest first, with their response and its history in each
+
+    Walks contact -> roster entries -> events -> responses, each step an
+    indexed lookup, instead of reading any roster in full.
+    """
+    contact = await contacts_collection.find_one({"id": contact_id, "owner_id": current_user["id"]}, CONTACT_PROJECTION)
+    if not contact:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    
+    person_by_roster = {
+        doc["roster_id"]: doc["id"]
+        async for doc in people_collection.find({"contact_id": contact_id}, {"_id": 0, "roster_id": 1, "id": 1})
+    }
+    events = await events_collection.find(
+        {"roster_id": {"$in": list(person_by_roster)}, "created_by": current_user["id"]},
+        {"_id": 0, "id": 1, "title": 1, "calamity_type": 1, "created_at": 1, "is_active": 1, "roster_id": 1}
+    ).to_list(length=None)
+    events.sort(key=lambda event: event["created_at"], reverse=True)
+    
+    latest = {}
+    history = defaultdict(list)
+    if events:
+        pairs = [{"event_id": event["id"], "person_id": person_by_roster[event["roster_id"]]} for event in events]
+        async for response in responses_collection.find(
+            {"$or": pairs}, {"_id": 0, "event_id": 1, "status": 1, "message": 1, "response_time": 1}
+        ):
+            latest[response.pop("event_id")] = response
+        async for entry in response_history_collection.find(
+            {"$or": pairs}, {"_id": 0, "event_id": 1, "status": 1, "previous_status": 1, "message": 1, "time": 1}
+        ).sort("time", ASCENDING):
+            history[entry.pop("event_id")].append(entry)
+    
+    return {
+        "contact": contact,
+        "events": [
+            {
+                "event_id": event["id"],
+                "title": event["title"],
+                "calamity_type": event["calamity_type"],
+                "created_at": event["created_at"],
+                "is_active": event["is_active"],
+                "person_id": person_by_roster[event["roster_id"]],
+                "response": latest.get(event["id"]),
+                "history": history[event["id"]],
+            }
+            for event in events
+        ],
+    }
 
 @app.get("/api/events/{event_id}/people")
-async def get_event_people(event_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+async def get_event_people(
+    event_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(safe|need_help|no_response)$"),
+    tag: Optional[str] = None,
+    name: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """The roster ordered by name; pages with limit/after, filters by status, tag and name prefix"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 0, "roster_id": 1})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    return event.get("people", [])
+    query = {"roster_id": event["roster_id"]}
+    if tag:
+        query["tags"] = tag
+    if name:
+        query.update(name_prefix_filter("name", name))
+    sort_fields = ["name", "id"]
+    requested = parse_fields(fields, PERSON_FIELDS)
+    if status_filter is None:
+        return await find_page(people_collection, query, sort_fields, limit, after, requested, response, PERSON_PROJECTION)
+    
+    # Status lives on the responses, so join each roster entry to its response by index
+    if after:
+        query = {"$and": [query, keyset_after(sort_fields, decode_cursor(after, sort_fields))]}
+    pipeline = [
+        {"$match": query},
+        {"$sort": {field: ASCENDING for field in sort_fields}},
+        {"$lookup": {
+            "from": responses_collection.name,
+            "let": {"person_id": "$id"},
+            "pipeline": [
+                {"$match": {"event_id": event_id, "$expr": {"$eq": ["$person_id", "$$person_id"]}}},
+                {"$project": {"_id": 0, "status": 1}},
+            ],
+            "as": "response",
+        }},
+        {"$match": {"response": {"$size": 0}} if status_filter == "no_response" else {"response.status": status_filter}},
+    ]
+    if limit is not None:
+        pipeline.append({"$limit": limit + 1})
+    pipeline.append({"$project": page_projection(requested, sort_fields, {**PERSON_PROJECTION, "response": 0})})
+    docs = await people_collection.aggregate(pipeline).to_list(length=None)
+    return finish_page(docs, limit, sort_fields, requested, response)
 
 @app.get("/api/events/{event_id}/responses")
-async def get_event_responses(event_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+async def get_event_responses(
+    event_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(safe|need_help)$"),
+    name: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Responses ordered by person id; pages with limit/after, filters by status and name prefix"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    responses = []
-    for response in responses_collection.find({"event_id": event_id}):
-        response = serialize_doc(response)
-        responses.append(response)
-    return responses
+    query = {"event_id": event_id}
+    if status_filter:
+        query["status"] = status_filter
+    if name:
+        query.update(name_prefix_filter("person_name", name))
+    return await find_page(
+        responses_collection, query, ["person_id"],
+        limit, after, parse_fields(fields, RESPONSE_FIELDS), response
+    )
 
 @app.get("/api/events/{event_id}/statistics")
 async def get_event_statistics(event_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    total_people = len(event.get("people", []))
-    responses = list(responses_collection.find({"event_id": event_id}))
+    return await read_event_statistics(event_id)
+
+@app.post("/api/events/{event_id}/statistics/rebuild")
+async def rebuild_event_statistics(event_id: str, current_user: dict = Depends(get_current_user)):
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
     
-    safe_count = len([r for r in responses if r["status"] == "safe"])
-    need_help_count = len([r for r in responses if r["status"] == "need_help"])
-    no_response_count = total_people - len(responses)
+    stats = await rebuild_event_counters(event_id)
+    await bump_event_version(event_id)
+    return stats
+
+async def dashboard_snapshot(event_id, event=None):
+    if event is None:
+        event = await events_collection.find_one({"id": event_id})
+    if not event:
+        return None
+    people = await people_collection.find({"roster_id": event["roster_id"]}, PERSON_PROJECTION).to_list(length=None)
+    responses = [serialize_doc(r) async for r in responses_collection.find({"event_id": event_id})]
+    counters = await read_event_counters(event_id)
+    return jsonable_encoder({
+        "type": "snapshot",
+        "event": serialize_doc(event),
+        "people": people,
+        "responses": responses,
+        "statistics": counters_statistics(counters),
+        # The counter versions the statistics were read at; see apply_counter_deltas
+        "counter_seqs": [{"tag": counter["tag"], "seq": counter.get("seq", 0)} for counter in counters],
+    }, custom_encoder={ObjectId: str})
+
+def naive_local_time(moment):
+    """A datetime as the naive local time response_time is stored in; aware values are converted first"""
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+
+@app.get("/api/events/{event_id}/timeline")
+async def get_event_timeline(
+    event_id: str,
+    bucket: str = Query("5m", pattern="^(1m|5m|15m|1h)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    """Responses per time bucket, with the cumulative response rate at the end of each"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
     
-    # Group by tags
-    tag_stats = {}
-    for person in event.get("people", []):
-        for tag in person.get("tags", []):
-            if tag not in tag_stats:
-                tag_stats[tag] = {"total": 0, "safe": 0, "need_help": 0, "no_response": 0}
-            tag_stats[tag]["total"] += 1
-            
-            # Find response for this person
-            person_response = next((r for r in responses if r["person_id"] == person["id"]), None)
-            if person_response:
-                tag_stats[tag][person_response["status"]] += 1
-            else:
-                tag_stats[tag]["no_response"] += 1
+    query = {"event_id": event_id, "minute": {"$gte": datetime(1970, 1, 1)}}
+    if since:
+        query["minute"]["$gte"] = naive_local_time(since)
+    if until:
+        query["minute"]["$lt"] = naive_local_time(until)
+    counter = await event_counters_collection.find_one({"event_id": event_id, "tag": None}, {"_id": 0, "total": 1})
+    total_people = counter.get("total", 0) if counter else 0
     
-    return {
-        "total_people": total_people,
-        "safe_count": safe_count,
-        "need_help_count": need_help_count,
-        "no_response_count": no_response_count,
-        "response_rate": (len(responses) / total_people * 100) if total_people > 0 else 0,
-        "tag_statistics": tag_stats,
-        "last_updated": datetime.now()
-    }
+    width = timedelta(minutes=TIMELINE_BUCKETS[bucket])
+    buckets = OrderedDict()
+    async for minute in response_timeline_collection.find(query, {"_id": 0, "event_id": 0}).sort("minute", ASCENDING):
+        start = datetime(1970, 1, 1) + (minute["minute"] - datetime(1970, 1, 1)) // width * width
+        counts = buckets.setdefault(start, {field: 0 for field in ("responses", "first_responses", "changes", *RESPONSE_STATUSES)})
+        for field in counts:
+            counts[field] += minute.get(field, 0)
+    
+    responded = 0
+    if since:
+        async for earlier in response_timeline_collection.aggregate([
+            {"$match": {"event_id": event_id, "minute": {"$lt": query["minute"]["$gte"]}}},
+            {"$group": {"_id": None, "first_responses": {"$sum": "$first_responses"}}},
+        ]):
+            responded = earlier["first_responses"]
+    timeline = []
+    for start, counts in buckets.items():
+        responded += counts["first_responses"]
+        timeline.append({
+            "start": start,
+            **counts,
+            "responded": responded,
+            "response_rate": round(responded / total_people * 100, 1) if total_people else 0,
+        })
+    return {"bucket": bucket, "total_people": total_people, "buckets": timeline}
+
+@app.get("/api/events/{event_id}/dashboard")
+async def get_event_dashboard(event_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """Event, roster, responses and statistics in one payload, with a version ETag"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    etag = event_etag(event)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return JSONResponse(await dashboard_snapshot(event_id, event), headers=headers)
+
+@app.post("/api/events/{event_id}/stream-token")
+async def issue_stream_token(event_id: str, current_user: dict = Depends(get_current_user)):
+    """A token for opening this event's stream, valid for STREAM_TOKEN_TTL_SECONDS"""
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    return {"token": create_stream_token(current_user, event_id), "expires_in": STREAM_TOKEN_TTL_SECONDS}
+
+@app.get("/api/events/{event_id}/stream")
+async def stream_event_updates(event_id: str, request: Request, token: str):
+    """Server-sent events for the dashboard: a snapshot on connect, then changes as they happen
+
+    EventSource cannot send an Authorization header, so the stream is opened
+    with a ``token`` query parameter. Only a token from the stream-token
+    route is accepted: URLs end up in access logs, and that token opens
+    this one stream for a minute, where the login token would open the
+    whole API until it expires.
+    """
+    current_user = await authenticate_token(token, scope="stream", event_id=event_id)
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    # Subscribe before taking the snapshot so no change can fall between the two
+    queue = dashboard_broadcaster.subscribe(event_id)
+    
+    async def event_stream():
+        try:
+            yield sse_message(await dashboard_snapshot(event_id))
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if message["type"] == "resync":
+                    message = await dashboard_snapshot(event_id)
+                    if message is None:
+                        break
+                yield sse_message(message)
+                if message["type"] == "event_deleted":
+                    break
+        finally:
+            dashboard_broadcaster.unsubscribe(event_id, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/events/{event_id}/export")
+async def export_event_roster(
+    event_id: str,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|xlsx)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]}, {"_id": 0, "title": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    filename = (re.sub(r"[^A-Za-z0-9]+", "-", event["title"]).strip("-").lower() or "event") + f"-roster.{export_format}"
+    if export_format == "csv":
+        body, media_type = csv_export(iter_export_rows(event_id)), "text/csv; charset=utf-8"
+    else:
+        body = xlsx_export(iter_export_rows(event_id))
+        media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
 
 @app.get("/api/events/{event_id}/share")
 async def get_share_link(event_id: str, current_user: dict = Depends(get_current_user)):
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -715,18 +3302,22 @@ async def get_share_link(event_id: str, current_user: dict = Depends(get_current
 @app.delete("/api/events/{event_id}")
 async def delete_event(event_id: str, current_user: dict = Depends(get_current_user)):
     # Check if event exists and belongs to user
-    event = events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
+    event = await events_collection.find_one({"id": event_id, "created_by": current_user["id"]})
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     # Soft delete the event
-    result = events_collection.update_one(
+    result = await events_collection.update_one(
         {"id": event_id, "created_by": current_user["id"]},
-        {"$set": {"is_active": False}}
+        {"$set": {"is_active": False}, "$inc": {"version": 1, "public_version": 1}}
     )
     
     # Also remove all responses associated with this event
-    responses_collection.delete_many({"event_id": event_id})
+    await responses_collection.delete_many({"event_id": event_id})
+    await event_counters_collection.delete_many({"event_id": event_id})
+    await response_history_collection.delete_many({"event_id": event_id})
+    await response_timeline_collection.delete_many({"event_id": event_id})
+    dashboard_broadcaster.publish(event_id, "event_deleted")
     
     return {"message": "Event deleted successfully"}
 
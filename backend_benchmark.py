@@ -0,0 +1,738 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+import requests
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    """Throughput and latency summary in milliseconds"""
+    return {
+        "requests": len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0.0,
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0.0,
+    }
+
+
+class PeopleMonitorBenchmark:
+    def __init__(self, base_url="http://localhost:8001"):
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+        self.token = None
+        self.event_id = None
+        self.people = []
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    def setup(self, roster_size):
+        """Register a throwaway admin and seed an event with a synthetic roster"""
+        email = f"bench_{datetime.now().strftime('%H%M%S%f')}@example.com"
+        response = self.session.post(f"{self.base_url}/api/auth/register", json={
+            "email": email,
+            "name": "Benchmark Admin",
+            "password": "BenchPass123!"
+        })
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+        response = self.session.post(f"{self.base_url}/api/events", headers=self.headers(), json={
+            "title": "Benchmark Drill",
+            "description": f"Synthetic roster of {roster_size} people",
+            "calamity_type": "earthquake"
+        })
+        response.raise_for_status()
+        self.event_id = response.json()["event_id"]
+
+        for start in range(0, roster_size, 1000):
+            batch = [
+                {"name": f"Person {i}", "contact": f"person{i}@example.com", "tags": [f"Team {i % 20}"]}
+                for i in range(start, min(start + 1000, roster_size))
+            ]
+            response = self.session.post(
+                f"{self.base_url}/api/events/{self.event_id}/people/bulk",
+                headers=self.headers(),
+                json={"people": batch}
+            )
+            response.raise_for_status()
+
+        response = self.session.get(f"{self.base_url}/api/events/{self.event_id}/people", headers=self.headers())
+        response.raise_for_status()
+        self.people = response.json()
+
+    def respond_concurrency(self, total_requests, concurrency):
+        """Fire respond requests from `concurrency` threads while probing GET /
+
+        With a blocking driver every in-flight respond serializes the event loop,
+        so the probe latency climbs with concurrency; with a non-blocking driver
+        the probe stays flat and respond throughput scales with the pool.
+        """
+        latencies = []
+        probe_latencies = []
+        errors = 0
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def respond(i):
+            nonlocal errors
+            person = self.people[i % len(self.people)]
+            started = time.perf_counter()
+            response = requests.post(f"{self.base_url}/api/events/{self.event_id}/respond", json={
+                "person_id": person["id"],
+                "person_name": person["name"],
+                "status": "safe" if i % 3 else "need_help",
+                "message": None
+            })
+            elapsed = time.perf_counter() - started
+            with lock:
+                if response.ok:
+                    latencies.append(elapsed)
+                else:
+                    errors += 1
+
+        def probe():
+            while not done.is_set():
+                started = time.perf_counter()
+                requests.get(f"{self.base_url}/")
+                probe_latencies.append(time.perf_counter() - started)
+                time.sleep(0.01)
+
+        prober = threading.Thread(target=probe, daemon=True)
+        prober.start()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(respond, range(total_requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        prober.join()
+
+        return {
+            "scenario": "respond_concurrency",
+            "concurrency": concurrency,
+            "roster_size": len(self.people),
+            "errors": errors,
+            "respond": summarize(latencies, elapsed),
+            "loop_probe": summarize(probe_latencies, elapsed),
+        }
+
+    def login_storm(self, total_requests, concurrency, storm_concurrency):
+        """Respond latency while `storm_concurrency` threads log in back to back
+
+        Each login costs a bcrypt verification; if that ran on the event loop the
+        respond p99 would track the login rate instead of the database.
+        """
+        email = f"storm_{datetime.now().strftime('%H%M%S%f')}@example.com"
+        self.session.post(f"{self.base_url}/api/auth/register", json={
+            "email": email,
+            "name": "Storm Coordinator",
+            "password": "StormPass123!"
+        }).raise_for_status()
+
+        login_latencies = []
+        rejected = 0
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def log_in():
+            nonlocal rejected
+            while not done.is_set():
+                started = time.perf_counter()
+                response = requests.post(f"{self.base_url}/api/auth/login", json={
+                    "email": email,
+                    "password": "StormPass123!"
+                })
+                elapsed = time.perf_counter() - started
+                with lock:
+                    if response.ok:
+                        login_latencies.append(elapsed)
+                    else:
+                        rejected += 1
+
+        stormers = [threading.Thread(target=log_in, daemon=True) for _ in range(storm_concurrency)]
+        started = time.perf_counter()
+        for stormer in stormers:
+            stormer.start()
+        result = self.respond_concurrency(total_requests, concurrency)
+        done.set()
+        for stormer in stormers:
+            stormer.join()
+
+        result["scenario"] = "login_storm"
+        result["storm_concurrency"] = storm_concurrency
+        result["login"] = summarize(login_latencies, time.perf_counter() - started)
+        result["login_rejected"] = rejected
+        return result
+
+    def wait_until_recorded(self, expected, timeout=60):
+        """Seconds until the statistics reflect `expected` responded people"""
+        started = time.perf_counter()
+        while time.perf_counter() - started < timeout:
+            stats = self.session.get(
+                f"{self.base_url}/api/events/{self.event_id}/statistics", headers=self.headers()
+            ).json()
+            if stats["safe_count"] + stats["need_help_count"] >= expected:
+                return time.perf_counter() - started
+            time.sleep(0.05)
+        return None
+
+
+@contextmanager
+def spawn_backend(port, **env):
+    """Run the backend under uvicorn in a subprocess with extra environment variables"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **{key: str(value) for key, value in env.items()}},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                if requests.get(f"{base_url}/").ok:
+                    break
+            except requests.ConnectionError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("Backend did not start")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+HOT_ROUTES = ["respond", "statistics", "response_page", "get_event_people", "login"]
+
+
+class RouteBenchmark:
+    """Seeds synthetic events and times the hot routes through a requests-like client
+
+    `client_factory` returns the client a worker thread should use; it may
+    be a requests.Session against a server or a TestClient around the app.
+    """
+
+    def __init__(self, client_factory, base_url=""):
+        self.client_factory = client_factory
+        self.base_url = base_url.rstrip("/")
+        self.local = threading.local()
+        self.email = f"routes_{datetime.now().strftime('%H%M%S%f')}@example.com"
+        self.password = "RoutesPass123!"
+        self.token = None
+        self.events = []
+
+    @property
+    def client(self):
+        if not hasattr(self.local, "client"):
+            self.local.client = self.client_factory()
+        return self.local.client
+
+    def headers(self):
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def call(self, method, path, **kwargs):
+        response = self.client.request(method, f"{self.base_url}{path}", **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+        return response
+
+    def seed(self, events, roster_size, response_rate, seed=42):
+        """Register an admin and create `events` events with rosters and some responses"""
+        rng = random.Random(seed)
+        self.token = self.call("POST", "/api/auth/register", json={
+            "email": self.email, "name": "Routes Benchmark", "password": self.password
+        }).json()["access_token"]
+
+        for number in range(events):
+            event_id = self.call("POST", "/api/events", headers=self.headers(), json={
+                "title": f"Benchmark Event {number}",
+                "description": f"Synthetic roster of {roster_size} people",
+                "calamity_type": "flood"
+            }).json()["event_id"]
+            for start in range(0, roster_size, 1000):
+                self.call("POST", f"/api/events/{event_id}/people/bulk", headers=self.headers(), json={"people": [
+                    {"name": f"Person {i}", "contact": f"person{i}@example.com", "tags": [f"Team {i % 20}"]}
+                    for i in range(start, min(start + 1000, roster_size))
+                ]})
+            people = []
+            after = None
+            while True:
+                response = self.call("GET", f"/api/events/{event_id}/people", headers=self.headers(),
+                                     params={"limit": 1000, "fields": "id,name", **({"after": after} if after else {})})
+                people.extend(response.json())
+                after = response.headers.get("X-Next-Cursor")
+                if not after:
+                    break
+            for person in people:
+                if rng.random() < response_rate:
+                    self.respond(event_id, person, rng)
+            self.events.append((event_id, people))
+
+    def respond(self, event_id, person, rng):
+        self.call("POST", f"/api/events/{event_id}/respond", json={
+            "person_id": person["id"],
+            "person_name": person["name"],
+            "status": rng.choice(["safe", "need_help"]),
+            "message": None
+        })
+
+    def request(self, route, rng):
+        event_id, people = rng.choice(self.events)
+        if route == "respond":
+            self.respond(event_id, rng.choice(people), rng)
+        elif route == "statistics":
+            self.call("GET", f"/api/events/{event_id}/statistics", headers=self.headers())
+        elif route == "response_page":
+            self.call("GET", f"/api/respond/{event_id}", headers={"Accept-Encoding": "gzip"})
+        elif route == "get_event_people":
+            self.call("GET", f"/api/events/{event_id}/people", headers=self.headers(), params={"limit": 100})
+        elif route == "login":
+            self.call("POST", "/api/auth/login", json={"email": self.email, "password": self.password})
+        else:
+            raise ValueError(f"Unknown route {route}")
+
+    def measure(self, route, total_requests, concurrency, seed=0):
+        latencies = []
+        errors = 0
+        lock = threading.Lock()
+
+        def one(i):
+            nonlocal errors
+            rng = random.Random(seed * 1_000_003 + i)
+            started = time.perf_counter()
+            try:
+                self.request(route, rng)
+            except Exception:
+                with lock:
+                    errors += 1
+                return
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(total_requests)))
+        return {"route": route, "concurrency": concurrency, "errors": errors,
+                **summarize(latencies, time.perf_counter() - started)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class PortalClient:
+    """requests-style client that runs an httpx.AsyncClient on the event loop behind a blocking portal"""
+
+    def __init__(self, portal, client):
+        self.portal = portal
+        self.client = client
+
+    def request(self, method, url, **kwargs):
+        return self.portal.call(functools.partial(self.client.request, method, url, **kwargs))
+
+
+@contextmanager
+def route_benchmark_target(args):
+    """RouteBenchmark against a running server, a spawned one, or the app in-process"""
+    if args.target == "url":
+        yield RouteBenchmark(requests.Session, args.base_url)
+    elif args.target == "spawn":
+        with spawn_backend(args.port) as base_url:
+            yield RouteBenchmark(requests.Session, base_url)
+    else:
+        import httpx
+        from fastapi.testclient import TestClient
+
+        import server
+
+        def worker_client():
+            return PortalClient(test_client.portal, httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=server.app), base_url="http://testserver"
+            ))
+
+        # The TestClient only runs the app's lifespan and event loop; each worker
+        # thread sends its requests through its own AsyncClient on that loop
+        with TestClient(server.app) as test_client:
+            yield RouteBenchmark(worker_client)
+
+
+def synthetic_roster(size, tags_per_person=2, response_rate=0.6, seed=42):
+    """Roster and response list shaped like the documents stored by the API"""
+    rng = random.Random(seed)
+    people = [
+        {"id": f"person-{i}", "tags": rng.sample([f"Team {t}" for t in range(50)], tags_per_person)}
+        for i in range(size)
+    ]
+    responses = [
+        {"person_id": person["id"], "status": rng.choice(["safe", "need_help"])}
+        for person in people if rng.random() < response_rate
+    ]
+    return people, responses
+
+
+def naive_statistics(people, responses):
+    """The original per-tag linear search over all responses"""
+    tag_stats = {}
+    for person in people:
+        for tag in person.get("tags", []):
+            if tag not in tag_stats:
+                tag_stats[tag] = {"total": 0, "safe": 0, "need_help": 0, "no_response": 0}
+            tag_stats[tag]["total"] += 1
+            person_response = next((r for r in responses if r["person_id"] == person["id"]), None)
+            if person_response:
+                tag_stats[tag][person_response["status"]] += 1
+            else:
+                tag_stats[tag]["no_response"] += 1
+    return tag_stats
+
+
+def hash_join_statistics(people, responses):
+    """compute_event_statistics' join, fed from in-memory lists instead of cursors"""
+    import asyncio
+
+    from server import join_statistics
+
+    async def stream(docs):
+        for doc in docs:
+            yield doc
+
+    return asyncio.run(join_statistics(stream(responses), stream(people)))["tag_statistics"]
+
+
+def synthetic_roster_file(rows, file_format):
+    """An HR-export-shaped roster upload with a Tags column and two Tag<n> columns"""
+    import io
+
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        "Name": [f"Person {i}" for i in range(rows)],
+        "Contact": [f"person{i}@example.com" for i in range(rows)],
+        "Tags": [f"Team {i % 20}, Site {i % 7}" for i in range(rows)],
+        "Tag1": [f"Shift {i % 3}" for i in range(rows)],
+        "Tag2": [None if i % 4 else "First aid" for i in range(rows)],
+    })
+    buffer = io.BytesIO()
+    if file_format == "csv":
+        frame.to_csv(buffer, index=False)
+    else:
+        frame.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def iterrows_roster(content):
+    """The original pd.read_excel + df.iterrows() parsing"""
+    import io
+
+    import pandas as pd
+
+    df = pd.read_excel(io.BytesIO(content))
+    people = []
+    for index, row in df.iterrows():
+        name = str(row['Name']).strip() if pd.notna(row['Name']) else ""
+        contact = str(row['Contact']).strip() if pd.notna(row['Contact']) else ""
+        tags = []
+        if 'Tags' in df.columns and pd.notna(row['Tags']):
+            tags = [tag.strip() for tag in str(row['Tags']).split(',') if tag.strip()]
+        for col in df.columns:
+            if col.startswith('Tag') and col != 'Tags' and pd.notna(row[col]):
+                tag = str(row[col]).strip()
+                if tag and tag not in tags:
+                    tags.append(tag)
+        if name and contact:
+            people.append({"id": str(uuid.uuid4()), "name": name, "contact": contact, "tags": tags})
+    return people
+
+
+def chunked_roster(content, filename):
+    """The streaming, column-wise parsing used by the upload endpoint"""
+    import io
+
+    from server import iter_roster_frames, roster_frame_to_people
+
+    people = []
+    for frame in iter_roster_frames(io.BytesIO(content), filename):
+        people.extend(roster_frame_to_people(frame)[0])
+    return people
+
+
+def measure(function, *args, trace_memory=False):
+    """Wall time in ms of one call, plus its traced peak allocation in MiB if asked
+
+    Tracing slows Python allocation-heavy code down several times, so timings
+    taken with it on are only comparable to each other.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - started
+    peak = None
+    if trace_memory:
+        peak = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        tracemalloc.stop()
+    return result, round(elapsed * 1000, 1), peak
+
+
+def run_import(args):
+    import server  # noqa: F401 -- keep the app import out of the first timing
+
+    results = []
+    for rows in args.rows:
+        for file_format in args.formats:
+            content = synthetic_roster_file(rows, file_format)
+            result = {"scenario": "import", "rows": rows, "format": file_format,
+                      "file_mib": round(len(content) / 2 ** 20, 1),
+                      "iterrows_ms": None, "iterrows_peak_mib": None}
+            people, result["chunked_ms"], result["chunked_peak_mib"] = measure(
+                chunked_roster, content, f"roster.{file_format}", trace_memory=args.trace_memory)
+            if file_format == "xlsx" and rows <= args.iterrows_max:
+                original, result["iterrows_ms"], result["iterrows_peak_mib"] = measure(
+                    iterrows_roster, content, trace_memory=args.trace_memory)
+                assert [(p["name"], p["contact"], p["tags"]) for p in original] == \
+                    [(p["name"], p["contact"], p["tags"]) for p in people], "parsers disagree"
+            results.append(result)
+            print(f"rows={rows:>7} {file_format:>4}  chunked {result['chunked_ms']:>9} ms  "
+                  f"iterrows {result['iterrows_ms']} ms  "
+                  f"peak MiB {result['chunked_peak_mib']} vs {result['iterrows_peak_mib']}", file=sys.stderr)
+    return results
+
+
+def run_statistics(args):
+    import server  # noqa: F401 -- keep the app import out of the first timing
+
+    results = []
+    for size in args.sizes:
+        people, responses = synthetic_roster(size)
+        started = time.perf_counter()
+        fast = hash_join_statistics(people, responses)
+        hash_join_s = time.perf_counter() - started
+
+        result = {"scenario": "statistics", "people": size, "responses": len(responses),
+                  "hash_join_ms": round(hash_join_s * 1000, 2), "naive_ms": None}
+        if size <= args.naive_max:
+            started = time.perf_counter()
+            slow = naive_statistics(people, responses)
+            result["naive_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            assert slow == fast, "hash join disagrees with the naive computation"
+        results.append(result)
+        print(f"people={size:>7}  hash join {result['hash_join_ms']:>9} ms  naive {result['naive_ms']} ms",
+              file=sys.stderr)
+    return results
+
+
+def run_respond(args):
+    bench = PeopleMonitorBenchmark(args.base_url)
+    bench.setup(args.roster_size)
+
+    results = []
+    for concurrency in args.concurrency:
+        result = bench.respond_concurrency(args.requests, concurrency)
+        results.append(result)
+        print(
+            f"concurrency={concurrency:>4}  "
+            f"respond {result['respond']['throughput_rps']:>8} req/s  "
+            f"p99 {result['respond']['p99_ms']:>8} ms  "
+            f"loop probe p99 {result['loop_probe']['p99_ms']:>8} ms",
+            file=sys.stderr
+        )
+    return results
+
+
+def run_login_storm(args):
+    bench = PeopleMonitorBenchmark(args.base_url)
+    bench.setup(args.roster_size)
+
+    results = []
+    for storm_concurrency in args.storm_concurrency:
+        if storm_concurrency:
+            result = bench.login_storm(args.requests, args.concurrency, storm_concurrency)
+        else:
+            result = bench.respond_concurrency(args.requests, args.concurrency)
+            result["scenario"] = "login_storm"
+            result["storm_concurrency"] = 0
+        results.append(result)
+        print(
+            f"logins={storm_concurrency:>4}  "
+            f"respond p99 {result['respond']['p99_ms']:>8} ms  "
+            f"login p99 {result.get('login', {}).get('p99_ms', '-'):>8} ms  "
+            f"rejected {result.get('login_rejected', 0)}",
+            file=sys.stderr
+        )
+    return results
+
+
+def run_routes(args):
+    """Throughput and latency percentiles of each hot route, with enough metadata to compare runs"""
+    with route_benchmark_target(args) as bench:
+        started = time.perf_counter()
+        bench.seed(args.events, args.roster_size, args.response_rate)
+        seed_s = time.perf_counter() - started
+
+        results = []
+        for route in args.routes:
+            total = args.login_requests if route == "login" else args.requests
+            result = bench.measure(route, total, args.concurrency)
+            results.append(result)
+            print(f"{route:>16}  {result['throughput_rps']:>9} req/s  p50 {result['p50_ms']:>8} ms  "
+                  f"p95 {result['p95_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  errors {result['errors']}",
+                  file=sys.stderr)
+
+    return {
+        "meta": {
+            "scenario": "routes",
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "target": args.target,
+            "events": args.events,
+            "roster_size": args.roster_size,
+            "response_rate": args.response_rate,
+            "concurrency": args.concurrency,
+            "seed_s": round(seed_s, 3),
+        },
+        "results": results,
+    }
+
+
+def run_compare(args):
+    """Per-route change between two `routes` result files (ratios are candidate / baseline)"""
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline = {result["route"]: result for result in json.load(baseline_file)["results"]}
+        candidate = {result["route"]: result for result in json.load(candidate_file)["results"]}
+
+    comparison = []
+    for route in [route for route in baseline if route in candidate]:
+        row = {"route": route}
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = baseline[route][metric], candidate[route][metric]
+            row[metric] = {"baseline": before, "candidate": after,
+                           "ratio": round(after / before, 3) if before else None}
+        comparison.append(row)
+        print(f"{route:>16}  req/s x{row['throughput_rps']['ratio']}  p50 x{row['p50_ms']['ratio']}  "
+              f"p99 x{row['p99_ms']['ratio']}", file=sys.stderr)
+    return comparison
+
+
+def run_respond_modes(args):
+    """Direct vs write-behind respond throughput, each on a freshly spawned backend"""
+    results = []
+    for mode in ("direct", "write_behind"):
+        with spawn_backend(args.port, RESPOND_WRITE_MODE=mode) as base_url:
+            bench = PeopleMonitorBenchmark(base_url)
+            bench.setup(args.roster_size)
+            result = bench.respond_concurrency(args.requests, args.concurrency)
+            result["scenario"] = "respond_modes"
+            result["mode"] = mode
+            drain_s = bench.wait_until_recorded(min(args.requests, args.roster_size))
+            result["drain_s"] = round(drain_s, 3) if drain_s is not None else None
+            results.append(result)
+            print(
+                f"{mode:>12}  respond {result['respond']['throughput_rps']:>8} req/s  "
+                f"p99 {result['respond']['p99_ms']:>8} ms  drained after {result['drain_s']} s",
+                file=sys.stderr
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="People Monitor API benchmarks")
+    subparsers = parser.add_subparsers(dest="scenario", required=True)
+
+    respond = subparsers.add_parser("respond", help="Concurrent /respond load against a running backend")
+    respond.add_argument("--base-url", default="http://localhost:8001")
+    respond.add_argument("--roster-size", type=int, default=500)
+    respond.add_argument("--requests", type=int, default=2000)
+    respond.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    respond.set_defaults(run=run_respond)
+
+    storm = subparsers.add_parser("login-storm", help="Respond latency during concurrent logins")
+    storm.add_argument("--base-url", default="http://localhost:8001")
+    storm.add_argument("--roster-size", type=int, default=500)
+    storm.add_argument("--requests", type=int, default=2000)
+    storm.add_argument("--concurrency", type=int, default=20)
+    storm.add_argument("--storm-concurrency", type=int, nargs="+", default=[0, 10, 50])
+    storm.set_defaults(run=run_login_storm)
+
+    modes = subparsers.add_parser("respond-modes", help="Direct vs write-behind respond on a spawned backend")
+    modes.add_argument("--port", type=int, default=8011)
+    modes.add_argument("--roster-size", type=int, default=2000)
+    modes.add_argument("--requests", type=int, default=10000)
+    modes.add_argument("--concurrency", type=int, default=100)
+    modes.set_defaults(run=run_respond_modes)
+
+    imports = subparsers.add_parser("import", help="Roster file parsing, streaming vs the original iterrows loop")
+    imports.add_argument("--rows", type=int, nargs="+", default=[1000, 50000, 200000])
+    imports.add_argument("--formats", nargs="+", choices=["csv", "xlsx"], default=["csv", "xlsx"])
+    imports.add_argument("--iterrows-max", type=int, default=50000,
+                         help="Largest upload to also parse with the original row-by-row loop")
+    imports.add_argument("--trace-memory", action="store_true", help="Also report peak allocation (slows parsing)")
+    imports.set_defaults(run=run_import)
+
+    routes = subparsers.add_parser("routes", help="Latency percentiles of the hot routes on seeded events")
+    routes.add_argument("--target", choices=["in-process", "spawn", "url"], default="in-process",
+                        help="App in-process (TestClient), a spawned uvicorn, or a running server at --base-url; "
+                             "the first two use the mongod at MONGO_URL")
+    routes.add_argument("--base-url", default="http://localhost:8001")
+    routes.add_argument("--port", type=int, default=8012)
+    routes.add_argument("--events", type=int, default=5)
+    routes.add_argument("--roster-size", type=int, default=2000)
+    routes.add_argument("--response-rate", type=float, default=0.5)
+    routes.add_argument("--requests", type=int, default=1000)
+    routes.add_argument("--login-requests", type=int, default=50)
+    routes.add_argument("--concurrency", type=int, default=20)
+    routes.add_argument("--routes", nargs="+", choices=HOT_ROUTES, default=HOT_ROUTES)
+    routes.set_defaults(run=run_routes)
+
+    compare = subparsers.add_parser("compare", help="Compare two `routes` result files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.set_defaults(run=run_compare)
+
+    stats = subparsers.add_parser("statistics", help="In-process statistics engine vs the original algorithm")
+    stats.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    stats.add_argument("--naive-max", type=int, default=10000,
+                       help="Largest roster to also time with the quadratic algorithm")
+    stats.set_defaults(run=run_statistics)
+
+    args = parser.parse_args()
+    print(json.dumps(args.run(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+import base64
+import csv
+import io
 import requests
 import sys
 import json
@@ -357,6 +360,58 @@ class PeopleMonitorAPITester:
 
         return all_success
 
+    def test_event_stream(self):
+        """Test the live dashboard stream: a stream token opens it and a response arrives as a change"""
+        if not self.created_event_id or not self.created_people:
+            print("❌ No event ID or people available for testing")
+            return False
+
+        success, response = self.run_test(
+            "Issue Stream Token",
+            "POST",
+            f"api/events/{self.created_event_id}/stream-token",
+            200,
+            auth_required=True
+        )
+        if not success:
+            return False
+
+        url = f"{self.base_url}/api/events/{self.created_event_id}/stream"
+        self.tests_run += 1
+        print(f"\n🔍 Testing Event Stream...")
+        print(f"   URL: {url}")
+        try:
+            # The login token is not accepted in the URL, only the scoped stream token
+            rejected = requests.get(url, params={"token": self.token}, timeout=10)
+            if rejected.status_code != 401:
+                print(f"❌ Failed - Expected 401 for the login token, got {rejected.status_code}")
+                return False
+
+            person = self.created_people[0]
+            with requests.get(url, params={"token": response["token"]}, stream=True, timeout=10) as stream:
+                messages = (
+                    json.loads(line[len("data: "):])
+                    for line in stream.iter_lines(decode_unicode=True) if line.startswith("data: ")
+                )
+                snapshot = next(messages)
+                if snapshot["type"] != "snapshot":
+                    print(f"❌ Failed - Expected a snapshot first, got {snapshot['type']}")
+                    return False
+                requests.post(
+                    f"{self.base_url}/api/events/{self.created_event_id}/respond",
+                    json={"person_id": person["id"], "person_name": person["name"], "status": "need_help"}
+                )
+                for message in messages:
+                    if message["type"] == "response" and message["response"]["person_id"] == person["id"]:
+                        self.tests_passed += 1
+                        print(f"✅ Passed - Stream delivered the response ({message['response']['status']})")
+                        return True
+            print("❌ Failed - Stream ended without the response")
+            return False
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+
     def test_get_event_responses(self):
         """Test getting event responses"""
         if not self.created_event_id:
@@ -376,6 +431,56 @@ class PeopleMonitorAPITester:
             return True
         return False
 
+    def test_export_roster(self):
+        """Test that the CSV export escapes formula-like cells and carries each person's response"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        suffix = datetime.now().strftime('%H%M%S')
+        name = "=cmd|' /C calc'!A0"
+        success, response = self.run_test(
+            "Add Person with Formula Name",
+            "POST",
+            f"api/events/{self.created_event_id}/people",
+            200,
+            data={"name": name, "contact": f"+1 555 02{suffix}", "tags": []},
+            auth_required=True
+        )
+        if not success:
+            return False
+        success, _ = self.run_test(
+            "Status Response: Formula Name - need_help",
+            "POST",
+            f"api/events/{self.created_event_id}/respond",
+            200,
+            data={"person_id": response["person_id"], "person_name": name, "status": "need_help", "message": "@SUM(1)"}
+        )
+        if not success:
+            return False
+
+        url = f"{self.base_url}/api/events/{self.created_event_id}/export?format=csv"
+        self.tests_run += 1
+        print("\n🔍 Testing CSV Export...")
+        print(f"   URL: {url}")
+        try:
+            response = requests.get(url, headers={'Authorization': f'Bearer {self.token}'})
+            rows = list(csv.reader(io.StringIO(response.content.decode("utf-8-sig"))))
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        if response.status_code != 200 or rows[0] != ["Name", "Contact", "Tags", "Status", "Message", "Response Time"]:
+            print(f"❌ Failed - Unexpected export: {response.status_code} {rows[:1]}")
+            return False
+        row = next((row for row in rows[1:] if row[1] == f"+1 555 02{suffix}"), None)
+        # Formula-like text gets a leading apostrophe; a phone number does not
+        if row is None or row[0] != "'" + name or row[3:5] != ["need_help", "'@SUM(1)"] or not row[5]:
+            print(f"❌ Failed - Unexpected row: {row}")
+            return False
+        self.tests_passed += 1
+        print(f"✅ Passed - Row: {row}")
+        return True
+
     def test_event_statistics(self):
         """Test getting event statistics"""
         if not self.created_event_id:
@@ -406,6 +511,125 @@ class PeopleMonitorAPITester:
             return True
         return False
 
+    def test_dashboard_etag(self):
+        """Test that the dashboard revalidates with 304 until the event changes"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        url = f"{self.base_url}/api/events/{self.created_event_id}/dashboard"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        self.tests_run += 1
+        print("\n🔍 Testing Dashboard ETag...")
+        print(f"   URL: {url}")
+        try:
+            first = requests.get(url, headers=headers)
+            etag = first.headers.get("ETag")
+            unchanged = requests.get(url, headers={**headers, 'If-None-Match': etag})
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        if first.status_code != 200 or not etag or unchanged.status_code != 304:
+            print(f"❌ Failed - Expected 200 with an ETag then 304, got {first.status_code} {etag!r} then {unchanged.status_code}")
+            return False
+        self.tests_passed += 1
+        print(f"✅ Passed - 304 for ETag {etag}")
+
+        suffix = datetime.now().strftime('%H%M%S')
+        success, response = self.run_test(
+            "Add Person After Dashboard Fetch",
+            "POST",
+            f"api/events/{self.created_event_id}/people",
+            200,
+            data={"name": "Etag Person", "contact": f"etag_{suffix}@example.com", "tags": []},
+            auth_required=True
+        )
+        if not success:
+            return False
+
+        self.tests_run += 1
+        print("\n🔍 Testing Dashboard ETag After Change...")
+        try:
+            changed = requests.get(url, headers={**headers, 'If-None-Match': etag})
+            people = changed.json().get("people", []) if changed.status_code == 200 else []
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        if changed.headers.get("ETag") == etag or not any(person["id"] == response["person_id"] for person in people):
+            print(f"❌ Failed - Expected 200 with the new person and a new ETag, got {changed.status_code} {changed.headers.get('ETag')!r}")
+            return False
+        self.tests_passed += 1
+        print(f"✅ Passed - 200 with new ETag {changed.headers.get('ETag')}")
+        return True
+
+    def test_statistics_match_rebuild(self):
+        """Test that the incrementally kept statistics agree with a full rebuild"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        # Repeated tags must count once, both incrementally and in the rebuild
+        contact = f"repeat_{datetime.now().strftime('%H%M%S')}@example.com"
+        success, response = self.run_test(
+            "Add Person with Repeated Tags",
+            "POST",
+            f"api/events/{self.created_event_id}/people",
+            200,
+            data={"name": "Repeat Tagger", "contact": contact, "tags": ["Dup", "Dup", " Dup "]},
+            auth_required=True
+        )
+        if not success:
+            return False
+        person_id = response["person_id"]
+
+        success, _ = self.run_test(
+            "Respond as Person with Repeated Tags",
+            "POST",
+            f"api/events/{self.created_event_id}/respond",
+            200,
+            data={"person_id": person_id, "person_name": "Repeat Tagger", "status": "need_help"}
+        )
+        if not success:
+            return False
+
+        success, _ = self.run_test(
+            "Retag Person with Repeated Tags",
+            "PUT",
+            f"api/events/{self.created_event_id}/people/{person_id}",
+            200,
+            data={"name": "Repeat Tagger", "contact": contact, "tags": ["Dup", "Other", "Other"]},
+            auth_required=True
+        )
+        if not success:
+            return False
+
+        success, incremental = self.run_test(
+            "Get Incremental Statistics",
+            "GET",
+            f"api/events/{self.created_event_id}/statistics",
+            200,
+            auth_required=True
+        )
+        if not success:
+            return False
+        success, rebuilt = self.run_test(
+            "Rebuild Statistics",
+            "POST",
+            f"api/events/{self.created_event_id}/statistics/rebuild",
+            200,
+            auth_required=True
+        )
+        if not success:
+            return False
+
+        incremental.pop("last_updated", None)
+        rebuilt.pop("last_updated", None)
+        if incremental != rebuilt:
+            print(f"❌ Statistics drifted from a rebuild:\n   incremental: {incremental}\n   rebuilt: {rebuilt}")
+            return False
+        print("   Incremental statistics match the rebuild")
+        return True
+
     def test_bulk_add_people_valid(self):
         """Test bulk adding people with valid data"""
         if not self.created_event_id:
@@ -448,6 +672,47 @@ class PeopleMonitorAPITester:
                 return False
         return False
 
+    def test_duplicate_contacts(self):
+        """Test that a contact already in the event is refused or skipped as a duplicate"""
+        if not self.created_event_id or len(self.created_people) < 2:
+            print("❌ No event ID or people available for testing")
+            return False
+
+        # Same address as an existing person, spelled differently (the first person's was updated)
+        existing = self.created_people[1]
+        success, _ = self.run_test(
+            "Add Person with Existing Contact",
+            "POST",
+            f"api/events/{self.created_event_id}/people",
+            409,
+            data={"name": "Repeat", "contact": f"  {existing['contact'].upper()} ", "tags": []},
+            auth_required=True
+        )
+        if not success:
+            return False
+
+        # One new phone number, the same number written differently, and an existing address
+        suffix = datetime.now().strftime('%H%M%S')
+        success, response = self.run_test(
+            "Bulk Add People (Duplicate Contacts)",
+            "POST",
+            f"api/events/{self.created_event_id}/people/bulk",
+            200,
+            data={"people": [
+                {"name": "Phone Person", "contact": f"+1 (555) 01-{suffix}", "tags": []},
+                {"name": "Phone Person Again", "contact": f"1555 01{suffix}", "tags": []},
+                {"name": "Existing Again", "contact": existing["contact"], "tags": []},
+            ]},
+            auth_required=True
+        )
+        if not success:
+            return False
+        if response.get("added_count") != 1 or response.get("duplicate_count") != 2:
+            print(f"❌ Failed - Expected 1 added and 2 duplicates, got {response.get('added_count')} and {response.get('duplicate_count')}")
+            return False
+        print("   Repeated contacts reported as duplicates")
+        return True
+
     def test_bulk_add_people_mixed_data(self):
         """Test bulk adding people with mixed valid/invalid data"""
         if not self.created_event_id:
@@ -695,6 +960,165 @@ class PeopleMonitorAPITester:
             print(f"❌ Failed - Error: {str(e)}")
             return False
 
+    def test_people_pagination(self):
+        """Test paging an event roster with X-Next-Cursor visits everyone once, and a forged cursor is rejected"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        url = f"{self.base_url}/api/events/{self.created_event_id}/people"
+        headers = {'Authorization': f'Bearer {self.token}'}
+        self.tests_run += 1
+        print(f"\n🔍 Testing People Pagination...")
+        print(f"   URL: {url}")
+        try:
+            everyone = requests.get(url, headers=headers).json()
+            paged, pages, params = [], 0, {"limit": 2}
+            while True:
+                response = requests.get(url, headers=headers, params=params)
+                pages += 1
+                if response.status_code != 200:
+                    print(f"❌ Failed - Expected 200, got {response.status_code}")
+                    return False
+                paged.extend(person["id"] for person in response.json())
+                cursor = response.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                params = {"limit": 2, "after": cursor}
+            if sorted(paged) != sorted(person["id"] for person in everyone) or len(paged) != len(set(paged)):
+                print(f"❌ Failed - Pages held {len(paged)} ids ({len(set(paged))} distinct), the roster {len(everyone)}")
+                return False
+
+            # An operator document in place of a sort value must not reach the query
+            forged = base64.urlsafe_b64encode(json.dumps([{"$ne": None}, {"$ne": None}]).encode()).decode()
+            response = requests.get(url, headers=headers, params={"limit": 2, "after": forged})
+            if response.status_code != 400:
+                print(f"❌ Failed - Expected 400 for a forged cursor, got {response.status_code}")
+                return False
+            self.tests_passed += 1
+            print(f"✅ Passed - {len(paged)} people over {pages} pages, forged cursor rejected")
+            return True
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+
+    def wait_for_import_job(self, status_url, timeout=60):
+        """Poll an import job until it completes or fails; None if it does neither in time"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = requests.get(f"{self.base_url}{status_url}", headers=headers).json()
+            if job.get("state") in ("completed", "failed"):
+                return job
+            time.sleep(0.5)
+        return None
+
+    def test_background_import(self):
+        """Test background roster imports, and that importing the same file again adds nobody twice"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        suffix = datetime.now().strftime('%H%M%S')
+        rows = [f"Import Person {i},import{i}_{suffix}@example.com,Imported" for i in range(25)]
+        csv_content = ("Name,Contact,Tags\n" + "\n".join(rows) + "\n").encode()
+        url = f"{self.base_url}/api/events/{self.created_event_id}/people/bulk/excel?background=true"
+        headers = {'Authorization': f'Bearer {self.token}'}
+
+        all_success = True
+        for attempt, (expected_added, expected_duplicates) in enumerate([(25, 0), (0, 25)], start=1):
+            self.tests_run += 1
+            print(f"\n🔍 Testing Background Import (run {attempt})...")
+            print(f"   URL: {url}")
+            try:
+                response = requests.post(url, files={"file": ("roster.csv", csv_content, "text/csv")}, headers=headers)
+                if response.status_code != 202:
+                    print(f"❌ Failed - Expected 202, got {response.status_code}")
+                    all_success = False
+                    continue
+                job = self.wait_for_import_job(response.json()["status_url"])
+                if job is None or job["state"] != "completed":
+                    print(f"❌ Failed - Job did not complete: {job}")
+                    all_success = False
+                    continue
+                if (job["added_count"], job["duplicate_count"]) != (expected_added, expected_duplicates):
+                    print(f"❌ Failed - Expected {expected_added} added and {expected_duplicates} duplicates, "
+                          f"got {job['added_count']} and {job['duplicate_count']}")
+                    all_success = False
+                    continue
+                self.tests_passed += 1
+                print(f"✅ Passed - {job['message']}")
+            except Exception as e:
+                print(f"❌ Failed - Error: {str(e)}")
+                all_success = False
+
+        success, people = self.run_test(
+            "Imported People Are Not Duplicated",
+            "GET",
+            f"api/events/{self.created_event_id}/people",
+            200,
+            auth_required=True
+        )
+        imported = [person for person in people if person["contact"].endswith(f"_{suffix}@example.com")] if success else []
+        if len(imported) != 25:
+            print(f"❌ Expected 25 imported people on the roster, found {len(imported)}")
+            return False
+        return all_success
+
+    def test_ndjson_line_errors(self):
+        """Test that NDJSON uploads and background bulk adds report invalid entries by line number"""
+        if not self.created_event_id:
+            print("❌ No event ID available for testing")
+            return False
+
+        suffix = datetime.now().strftime('%H%M%S')
+        body = "\n".join([
+            json.dumps({"name": "Ndjson Person", "contact": f"ndjson_{suffix}@example.com", "tags": []}),
+            "",
+            "{not json",
+            json.dumps({"name": " ", "contact": "blank@example.com", "tags": []}),
+        ]) + "\n"
+        url = f"{self.base_url}/api/events/{self.created_event_id}/people/ndjson"
+        headers = {'Authorization': f'Bearer {self.token}', 'Content-Type': 'application/x-ndjson'}
+
+        self.tests_run += 1
+        print("\n🔍 Testing NDJSON Upload Line Errors...")
+        print(f"   URL: {url}")
+        try:
+            response = requests.post(url, data=body.encode(), headers=headers)
+            result = response.json()
+        except Exception as e:
+            print(f"❌ Failed - Error: {str(e)}")
+            return False
+        errors = result.get("errors", [])
+        # The blank second line is skipped but still counted
+        if (response.status_code != 200 or result.get("added_count") != 1 or len(errors) != 2
+                or not errors[0].startswith("Line 3: ") or errors[1] != "Line 4: Name and contact are required"):
+            print(f"❌ Failed - Unexpected result: {response.status_code} {result}")
+            return False
+        self.tests_passed += 1
+        print(f"✅ Passed - Errors: {errors}")
+
+        success, response = self.run_test(
+            "Background Bulk Add Line Errors",
+            "POST",
+            f"api/events/{self.created_event_id}/people/bulk?background=true",
+            202,
+            data={"people": [
+                {"name": "Background Person", "contact": f"background_{suffix}@example.com", "tags": []},
+                {"name": "", "contact": "nobody@example.com", "tags": []},
+            ]},
+            auth_required=True
+        )
+        if not success:
+            return False
+        job = self.wait_for_import_job(response["status_url"])
+        if job is None or job["errors"] != ["Line 2: Name and contact are required"]:
+            print(f"❌ Failed - Unexpected job result: {job}")
+            return False
+        print("   Both paths report errors as \"Line n\"")
+        return True
+
     def test_error_cases(self):
         """Test error handling"""
         print(f"\n🔍 Testing Error Cases...")
@@ -762,6 +1186,7 @@ def main():
     test_results.append(("Get Specific Event", tester.test_get_specific_event()))
     test_results.append(("Add People to Event", tester.test_add_people_to_event()))
     test_results.append(("Get Event People", tester.test_get_event_people()))
+    test_results.append(("People Pagination", tester.test_people_pagination()))
     
     # NEW FEATURES TESTING
     test_results.append(("Update Event Details", tester.test_update_event()))
@@ -769,9 +1194,12 @@ def main():
     test_results.append(("Update Person Details", tester.test_update_person()))
     test_results.append(("Remove Person from Event", tester.test_remove_person()))
     test_results.append(("Excel Upload Endpoint", tester.test_excel_upload_simulation()))
+    test_results.append(("Background Import", tester.test_background_import()))
+    test_results.append(("NDJSON Line Errors", tester.test_ndjson_line_errors()))
     
     # Bulk add people tests
     test_results.append(("Bulk Add People (Valid Data)", tester.test_bulk_add_people_valid()))
+    test_results.append(("Duplicate Contacts", tester.test_duplicate_contacts()))
     test_results.append(("Bulk Add People (Mixed Data)", tester.test_bulk_add_people_mixed_data()))
     test_results.append(("Bulk Add People (Empty Data)", tester.test_bulk_add_people_empty_data()))
     test_results.append(("Bulk Add People (Non-existent Event)", tester.test_bulk_add_people_nonexistent_event()))
@@ -781,10 +1209,14 @@ def main():
     # Public response functionality (no auth required)
     test_results.append(("Public Response Page", tester.test_public_response_page()))
     test_results.append(("Status Responses", tester.test_status_responses()))
+    test_results.append(("Event Stream", tester.test_event_stream()))
     
     # Admin monitoring (auth required)
     test_results.append(("Get Event Responses", tester.test_get_event_responses()))
+    test_results.append(("Export Roster", tester.test_export_roster()))
     test_results.append(("Event Statistics", tester.test_event_statistics()))
+    test_results.append(("Dashboard ETag", tester.test_dashboard_etag()))
+    test_results.append(("Statistics Match Rebuild", tester.test_statistics_match_rebuild()))
     test_results.append(("Error Cases", tester.test_error_cases()))
 
     # Print summary
@@ -1,10 +1,10 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import './App.css';
 import { Button } from './components/ui/button';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogFooter } from './components/ui/dialog';
 import { AlertDialog, AlertDialogTrigger, AlertDialogContent, AlertDialogHeader, AlertDialogTitle, AlertDialogDescription, AlertDialogFooter, AlertDialogAction, AlertDialogCancel } from './components/ui/alert-dialog';
 import { Tabs, TabsContent, TabsList, TabsTrigger } from './components/ui/tabs';
-import { Edit, Trash2, Copy, Share, Plus, Upload, UserPlus, MoreHorizontal } from 'lucide-react';
+import { Edit, Trash2, Copy, Share, Plus, Upload, Download, UserPlus, MoreHorizontal } from 'lucide-react';
 
 const API_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
 
@@ -28,6 +28,11 @@ function App() {
   const [editingPerson, setEditingPerson] = useState(null);
   const [currentEvent, setCurrentEvent] = useState(null);
   const [deleteEventId, setDeleteEventId] = useState(null);
+  const dashboardEtag = useRef({ eventId: null, etag: null });
+  // Whether the dashboard stream is connected and will push our own changes back
+  const streamConnected = useRef(false);
+  // Latest seq applied per counter (tag), so repeated or late counter updates are ignored
+  const counterSeqs = useRef({});
 
   // Auth form
   const [authForm, setAuthForm] = useState({
@@ -92,9 +97,45 @@ function App() {
 
   useEffect(() => {
     if (selectedEvent && isAuthenticated) {
-      fetchEventDetails();
-      const interval = setInterval(fetchEventDetails, 5000); // Refresh every 5 seconds
-      return () => clearInterval(interval);
+      // The stream opens with a full snapshot and then pushes only changes.
+      // It is opened with a short-lived stream token rather than the login
+      // token, since the token is part of the URL; EventSource retries a
+      // dropped connection on its own, and once that token has expired we
+      // fetch a new one and reopen.
+      let source = null;
+      let retry = null;
+      let closed = false;
+      const open = async () => {
+        try {
+          const response = await fetch(`${API_URL}/api/events/${selectedEvent}/stream-token`, {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+          });
+          if (!response.ok || closed) return;
+          const { token } = await response.json();
+          source = new EventSource(
+            `${API_URL}/api/events/${selectedEvent}/stream?token=${encodeURIComponent(token)}`
+          );
+          source.onopen = () => { streamConnected.current = true; };
+          source.onmessage = (message) => applyDashboardUpdate(JSON.parse(message.data));
+          source.onerror = () => {
+            streamConnected.current = false;
+            if (source.readyState === EventSource.CLOSED && !closed) {
+              retry = setTimeout(open, 2000);
+            }
+          };
+        } catch (error) {
+          console.error('Error opening event stream:', error);
+          if (!closed) retry = setTimeout(open, 2000);
+        }
+      };
+      open();
+      return () => {
+        closed = true;
+        streamConnected.current = false;
+        clearTimeout(retry);
+        if (source) source.close();
+      };
     }
   }, [selectedEvent, isAuthenticated]);
 
@@ -192,30 +233,114 @@ function App() {
       const headers = {
         'Authorization': `Bearer ${token}`
       };
+      // Only revalidate against the ETag we hold for this same event
+      if (dashboardEtag.current.eventId === selectedEvent && dashboardEtag.current.etag) {
+        headers['If-None-Match'] = dashboardEtag.current.etag;
+      }
+
+      const response = await fetch(`${API_URL}/api/events/${selectedEvent}/dashboard`, { headers });
 
-      const [eventRes, peopleRes, statsRes, responsesRes] = await Promise.all([
-        fetch(`${API_URL}/api/events/${selectedEvent}`, { headers }),
-        fetch(`${API_URL}/api/events/${selectedEvent}/people`, { headers }),
-        fetch(`${API_URL}/api/events/${selectedEvent}/statistics`, { headers }),
-        fetch(`${API_URL}/api/events/${selectedEvent}/responses`, { headers })
-      ]);
-
-      if (eventRes.ok && peopleRes.ok && statsRes.ok && responsesRes.ok) {
-        const eventData = await eventRes.json();
-        const peopleData = await peopleRes.json();
-        const statsData = await statsRes.json();
-        const responsesData = await responsesRes.json();
-
-        setCurrentEvent(eventData);
-        setPeople(peopleData);
-        setEventStatistics(statsData);
-        setResponses(responsesData);
+      if (response.status === 304) return;
+      if (response.ok) {
+        dashboardEtag.current = { eventId: selectedEvent, etag: response.headers.get('ETag') };
+        applyDashboardUpdate(await response.json());
       }
     } catch (error) {
       console.error('Error fetching event details:', error);
     }
   };
 
+  // After an admin change: the stream pushes it back while it is connected,
+  // so the dashboard is only revalidated (against its ETag) when it is not
+  const refreshEventDetails = () => {
+    if (!streamConnected.current) fetchEventDetails();
+  };
+
+  const upsertById = (items, updated, key = 'id') => {
+    const index = items.findIndex(item => item[key] === updated[key]);
+    if (index === -1) return [...items, updated];
+    const next = [...items];
+    next[index] = { ...next[index], ...updated };
+    return next;
+  };
+
+  const counterKey = (tag) => JSON.stringify(tag);
+
+  const freshCounters = (counters) => counters.filter(({ tag, seq = 0 }) => {
+    const key = counterKey(tag);
+    if (key in counterSeqs.current && counterSeqs.current[key] >= seq) return false;
+    counterSeqs.current[key] = seq;
+    return true;
+  });
+
+  const applyCounters = (stats, counters) => {
+    if (!stats) return stats;
+    const next = { ...stats, tag_statistics: { ...stats.tag_statistics } };
+    counters.forEach(({ tag, total = 0, safe = 0, need_help = 0 }) => {
+      if (tag === null) {
+        next.total_people = total;
+        next.safe_count = safe;
+        next.need_help_count = need_help;
+        return;
+      }
+      const updated = { total, safe, need_help };
+      updated.no_response = updated.total - updated.safe - updated.need_help;
+      if (updated.total > 0) {
+        next.tag_statistics[tag] = updated;
+      } else {
+        delete next.tag_statistics[tag];
+      }
+    });
+    const responded = next.safe_count + next.need_help_count;
+    next.no_response_count = next.total_people - responded;
+    next.response_rate = next.total_people > 0 ? (responded / next.total_people) * 100 : 0;
+    next.last_updated = new Date().toISOString();
+    return next;
+  };
+
+  const applyDashboardUpdate = (update) => {
+    switch (update.type) {
+      case 'snapshot':
+        setCurrentEvent(update.event);
+        setPeople(update.people);
+        setResponses(update.responses);
+        setEventStatistics(update.statistics);
+        counterSeqs.current = Object.fromEntries(
+          update.counter_seqs.map(({ tag, seq }) => [counterKey(tag), seq])
+        );
+        break;
+      case 'event_updated':
+        setCurrentEvent(event => ({ ...event, ...update.event }));
+        break;
+      case 'people_added':
+        setPeople(current => update.people.reduce((next, person) => upsertById(next, person), current));
+        break;
+      case 'person_updated':
+        setPeople(current => upsertById(current, update.person));
+        break;
+      case 'person_removed':
+        setPeople(current => current.filter(person => person.id !== update.person_id));
+        setResponses(current => current.filter(response => response.person_id !== update.person_id));
+        break;
+      case 'response':
+        setResponses(current => upsertById(current, update.response, 'person_id'));
+        break;
+      case 'counters': {
+        const counters = freshCounters(update.counters);
+        if (counters.length) {
+          setEventStatistics(stats => applyCounters(stats, counters));
+        }
+        break;
+      }
+      case 'event_deleted':
+        setSelectedEvent(null);
+        fetchEvents();
+        break;
+      default:
+        break;
+    }
+  };
+
   const createEvent = async (e) => {
     e.preventDefault();
     try {
@@ -256,7 +381,7 @@ function App() {
         setShowEditEvent(false);
         setEditEventForm({ title: '', description: '', calamity_type: 'flood' });
         fetchEvents();
-        fetchEventDetails();
+        refreshEventDetails();
       }
     } catch (error) {
       console.error('Error updating event:', error);
@@ -328,7 +453,7 @@ function App() {
       if (response.ok) {
         setShowAddPerson(false);
         setPersonForm({ name: '', contact: '', tags: [] });
-        fetchEventDetails();
+        refreshEventDetails();
       }
     } catch (error) {
       console.error('Error adding person:', error);
@@ -352,7 +477,7 @@ function App() {
         setShowEditPerson(false);
         setEditingPerson(null);
         setEditPersonForm({ name: '', contact: '', tags: [] });
-        fetchEventDetails();
+        refreshEventDetails();
       }
     } catch (error) {
       console.error('Error updating person:', error);
@@ -370,7 +495,7 @@ function App() {
       });
 
       if (response.ok) {
-        fetchEventDetails();
+        refreshEventDetails();
       }
     } catch (error) {
       console.error('Error deleting person:', error);
@@ -458,7 +583,7 @@ function App() {
         setBulkResult(result);
         if (result.added_count > 0) {
           setBulkData('');
-          fetchEventDetails();
+          refreshEventDetails();
         }
       } else {
         const error = await response.json();
@@ -483,7 +608,7 @@ function App() {
       formData.append('file', excelFile);
 
       const token = localStorage.getItem('token');
-      const response = await fetch(`${API_URL}/api/events/${selectedEvent}/people/bulk/excel`, {
+      const response = await fetch(`${API_URL}/api/events/${selectedEvent}/people/bulk/excel?background=true`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`
@@ -492,11 +617,29 @@ function App() {
       });
 
       if (response.ok) {
-        const result = await response.json();
+        // The import runs as a background job; poll it until it finishes
+        let job = await response.json();
+        while (job.state !== 'completed' && job.state !== 'failed') {
+          await new Promise((resolve) => setTimeout(resolve, 1000));
+          const jobResponse = await fetch(`${API_URL}/api/import-jobs/${job.job_id || job.id}`, {
+            headers: {
+              'Authorization': `Bearer ${token}`
+            }
+          });
+          if (!jobResponse.ok) {
+            throw new Error('Error checking import progress');
+          }
+          job = await jobResponse.json();
+        }
+        if (job.state === 'failed') {
+          alert(job.detail || 'Error uploading Excel file');
+          return;
+        }
+        const result = { ...job, total_rows: job.rows_processed };
         setExcelResult(result);
         if (result.added_count > 0) {
           setExcelFile(null);
-          fetchEventDetails();
+          refreshEventDetails();
         }
       } else {
         const error = await response.json();
@@ -566,6 +709,33 @@ function App() {
     }
   };
 
+  const exportRoster = async (format) => {
+    try {
+      const token = localStorage.getItem('token');
+      const response = await fetch(`${API_URL}/api/events/${selectedEvent}/export?format=${format}`, {
+        headers: {
+          'Authorization': `Bearer ${token}`
+        }
+      });
+
+      if (response.ok) {
+        const disposition = response.headers.get('Content-Disposition') || '';
+        const match = disposition.match(/filename="([^"]+)"/);
+        const url = URL.createObjectURL(await response.blob());
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = match ? match[1] : `roster.${format}`;
+        link.click();
+        URL.revokeObjectURL(url);
+      } else {
+        alert('Error exporting roster');
+      }
+    } catch (error) {
+      console.error('Error exporting roster:', error);
+      alert('Error exporting roster');
+    }
+  };
+
   const getStatusColor = (status) => {
     switch (status) {
       case 'safe': return 'text-green-600';
@@ -794,6 +964,14 @@ function App() {
                   <Share className="w-4 h-4 mr-2" />
                   Share
                 </Button>
+                <Button variant="outline" onClick={() => exportRoster('csv')}>
+                  <Download className="w-4 h-4 mr-2" />
+                  Export CSV
+                </Button>
+                <Button variant="outline" onClick={() => exportRoster('xlsx')}>
+                  <Download className="w-4 h-4 mr-2" />
+                  Export Excel
+                </Button>
                 <Button variant="outline" onClick={() => setShowAddPerson(true)}>
                   <UserPlus className="w-4 h-4 mr-2" />
                   Add Person
@@ -1277,7 +1455,7 @@ Mike Johnson, mike@company.com, IT Team"
                     <ul className="text-sm text-muted-foreground space-y-1">
                       <li>• Required columns: <strong>Name</strong>, <strong>Contact</strong></li>
                       <li>• Optional columns: <strong>Tags</strong> (comma-separated) or <strong>Tag1</strong>, <strong>Tag2</strong>, etc.</li>
-                      <li>• File must be .xlsx or .xls format</li>
+                      <li>• File must be .xlsx, .xls or .csv format</li>
                       <li>• First row should contain column headers</li>
                     </ul>
                   </div>
@@ -1288,7 +1466,7 @@ Mike Johnson, mike@company.com, IT Team"
                     </label>
                     <input
                       type="file"
-                      accept=".xlsx,.xls"
+                      accept=".xlsx,.xls,.csv"
                       onChange={(e) => setExcelFile(e.target.files[0])}
                       className="w-full p-3 border border-input rounded-md bg-background text-foreground"
                       required